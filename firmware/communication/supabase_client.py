@@ -8,14 +8,134 @@ Strictly adhering to project constraints:
 - Explicit control over headers and payload
 """
 
+import gzip
 import http.client
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+import queue
+import random
+import ssl
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
 from urllib.parse import urlparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Request bodies larger than this (bytes) are sent gzip-compressed
+GZIP_MIN_SIZE = 512
+
+# POST retries for transient failures, with capped exponential backoff
+# (seconds) jittered so devices don't retry in lockstep
+POST_RETRIES = 3
+POST_BACKOFF = 0.3
+POST_BACKOFF_MAX = 5.0
+
+# Gateway errors: the request never reached PostgREST
+_RETRY_STATUSES = frozenset((502, 503, 504))
+
+# Replies from a server (or proxy) that won't take a gzip request body
+_GZIP_REJECTED = frozenset((400, 415))
+
+
+def _encode(payload: Any) -> bytes:
+    """Serialize to compact JSON bytes (orjson when available, else stdlib)"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+# Columns accepted by the Supabase 'readings' table
+_ALLOWED_KEYS = frozenset(
+    (
+        "created_at",
+        "device_id",
+        "user_id",
+        "voltage",
+        "force_percent",
+        "state",
+        "variance",
+    )
+)
+
+# Decimal places kept per numeric column on upload. The ADC resolves
+# 0.125 mV at ±4.096 V, so 4 places keep every voltage step; the digits
+# past these are noise that JSON (and gzip) would otherwise carry
+_UPLOAD_PRECISION = {"voltage": 4, "force_percent": 2, "variance": 6}
+
+# One TLS context for every client: the CA bundle is loaded once per process
+_SSL_CTX = ssl.create_default_context()
+
+
+class _ResumingHTTPSConnection(http.client.HTTPSConnection):
+    """HTTPSConnection that offers a previous TLS session on connect"""
+
+    def __init__(self, host: str, session: Optional[ssl.SSLSession] = None, **kwargs):
+        super().__init__(host, context=_SSL_CTX, **kwargs)
+        self._session = session
+
+    def connect(self):
+        if self._session is None:
+            return super().connect()
+
+        # Same as HTTPSConnection.connect, but resuming the given session
+        http.client.HTTPConnection.connect(self)
+        self.sock = _SSL_CTX.wrap_socket(
+            self.sock, server_hostname=self.host, session=self._session
+        )
+
+
+class CircuitBreaker:
+    """
+    Skips remote calls for a while after repeated failures.
+
+    After `fail_thresh` consecutive failures the breaker opens and `allow()`
+    returns False for `reset` seconds. The next call after that is let
+    through as a trial; success closes the breaker, failure re-opens it.
+    """
+
+    def __init__(self, fail_thresh: int = 5, reset: float = 30.0):
+        """
+        Args:
+            fail_thresh: Consecutive failures before the breaker opens
+            reset: Seconds to stay open before allowing a trial call
+        """
+        self.fail_thresh = fail_thresh
+        self.reset = reset
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """Return True if a remote call may be attempted."""
+        if self._opened_at is None:
+            return True
+        return time.monotonic() - self._opened_at >= self.reset
+
+    def record(self, success: bool):
+        """Record the outcome of a remote call."""
+        if success:
+            self._failures = 0
+            self._opened_at = None
+            return
+
+        self._failures += 1
+        if self._failures >= self.fail_thresh:
+            if self._opened_at is None:
+                logger.warning(
+                    f"Circuit breaker open after {self._failures} failures, "
+                    f"pausing remote calls for {self.reset}s"
+                )
+            self._opened_at = time.monotonic()
+
 
 class SupabaseClient:
     """
@@ -49,6 +169,136 @@ class SupabaseClient:
             "Prefer": "return=minimal",  # Don't send back the inserted object, saves bandwidth
         }
 
+        # Persistent connection reused across requests (HTTP/1.1 keep-alive)
+        self._conn: Optional[http.client.HTTPSConnection] = None
+        self._lock = threading.Lock()
+        # Last TLS session, offered on reconnect to skip a full handshake
+        self._tls_session: Optional[ssl.SSLSession] = None
+
+        # Stop hammering the backend (and doing doomed TLS handshakes) during outages
+        self._breaker = CircuitBreaker()
+
+        # Cleared once the server is seen rejecting gzip bodies (see _post)
+        self._gzip = True
+
+        # Background uploader, started on first submit()
+        self._upload_q: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._uploader: Optional[threading.Thread] = None
+        # Keys of submitted jobs not yet finished (see submit)
+        self._pending_keys: set = set()
+        self._pending_lock = threading.Lock()
+
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        body: Optional[Union[str, bytes]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, bytes]:
+        """
+        Send a request over the persistent connection.
+
+        The TCP/TLS connection is opened on first use and kept alive between
+        calls. If the server has dropped it, reconnect and retry once.
+        Gzip-encoded responses are decompressed transparently.
+
+        Returns:
+            Tuple of (HTTP status, response body)
+        """
+        with self._lock:
+            for attempt in range(2):
+                if self._conn is None:
+                    self._conn = _ResumingHTTPSConnection(
+                        self.host, session=self._tls_session, timeout=10
+                    )
+                    self._conn.connect()
+
+                try:
+                    self._conn.request(method, endpoint, body, headers or {})
+                    response = self._conn.getresponse()
+                    # Always consume the body so the connection can be reused
+                    data = response.read()
+                    if response.getheader("Content-Encoding") == "gzip":
+                        data = gzip.decompress(data)
+                    # TLS 1.3 tickets arrive after the handshake, so grab the
+                    # session once a response has been read
+                    if self._conn.sock is not None:
+                        self._tls_session = self._conn.sock.session
+                    return response.status, data
+
+                except (http.client.HTTPException, ConnectionError) as e:
+                    self._conn.close()
+                    self._conn = None
+                    if attempt:
+                        raise
+                    logger.warning(f"Connection dropped, reconnecting: {e}")
+
+                except Exception:
+                    self._conn.close()
+                    self._conn = None
+                    raise
+
+    def submit(self, job: Callable[[], Any], key: Optional[str] = None) -> bool:
+        """
+        Run a callable on the background uploader thread.
+
+        Network round-trips then overlap with sampling and with the
+        DataManager's disk writes instead of blocking either of them.
+
+        Args:
+            job: Function taking no arguments
+            key: If given, the job is skipped while another job with the
+                same key is still queued or running (so periodic syncs
+                don't pile up behind a slow link)
+
+        Returns:
+            True if queued, False if skipped as a duplicate
+        """
+        if key is not None:
+            with self._pending_lock:
+                if key in self._pending_keys:
+                    return False
+                self._pending_keys.add(key)
+
+        if self._uploader is None or not self._uploader.is_alive():
+            self._uploader = threading.Thread(
+                target=self._upload_loop, name="SupabaseUploader", daemon=True
+            )
+            self._uploader.start()
+        self._upload_q.put((job, key))
+        return True
+
+    def _upload_loop(self):
+        """Uploader thread: run submitted jobs in order until stopped"""
+        while True:
+            item = self._upload_q.get()
+            try:
+                if item is None:
+                    return
+                job, key = item
+                try:
+                    job()
+                finally:
+                    if key is not None:
+                        with self._pending_lock:
+                            self._pending_keys.discard(key)
+            except Exception as e:
+                logger.error(f"Supabase upload job failed: {e}")
+            finally:
+                self._upload_q.task_done()
+
+    def close(self):
+        """Finish queued uploads, stop the uploader and close the connection"""
+        if self._uploader is not None and self._uploader.is_alive():
+            self._upload_q.put(None)
+            self._uploader.join()
+        self._uploader = None
+
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
     def _get(self, table: str, params: Optional[str] = None) -> List[Dict]:
         """
         Internal method to execute raw HTTP GET.
@@ -60,40 +310,36 @@ class SupabaseClient:
         Returns:
             List of dictionaries if successful, empty list otherwise
         """
-        conn = None
         try:
-            conn = http.client.HTTPSConnection(self.host, timeout=10)
-
             endpoint = f"{self.base_path}/rest/v1/{table}"
             if params:
                 endpoint += params
 
             # Use headers without "return=minimal" for GET requests
             get_headers = {k: v for k, v in self.headers.items() if k != "Prefer"}
+            get_headers["Accept-Encoding"] = "gzip"
 
-            conn.request("GET", endpoint, headers=get_headers)
-            response = conn.getresponse()
+            status, data = self._request("GET", endpoint, headers=get_headers)
 
-            if response.status == 200:
-                data = response.read().decode()
+            if status == 200:
+                data = data.decode()
                 return json.loads(data) if data else []
             else:
-                logger.error(
-                    f"HTTP Error {response.status}: {response.read().decode()}"
-                )
+                logger.error(f"HTTP Error {status}: {data.decode()}")
                 return []
 
         except Exception as e:
             logger.error(f"GET request failed: {e}")
             return []
-        finally:
-            if conn:
-                conn.close()
 
     def _post(self, table: str, payload: Union[Dict[str, Any], List[Dict[str, Any]]]) -> bool:
         """
         Internal method to execute raw HTTP POST.
 
+        Large bodies are gzip-compressed. If the server answers 400/415 to
+        a compressed body it is resent uncompressed, and if that succeeds
+        this client stops compressing.
+
         Args:
             table: Table name (endpoint)
             payload: Dictionary (single) or List (batch) to send
@@ -101,38 +347,74 @@ class SupabaseClient:
         Returns:
             True if successful (201 Created), False otherwise
         """
-        conn = None
+        if not self._breaker.allow():
+            logger.debug("Circuit breaker open, skipping POST")
+            return False
+
         try:
-            # 1. Establish connection (TCP/TLS handshake)
-            conn = http.client.HTTPSConnection(self.host, timeout=10)
+            # 1. Serialize JSON straight to bytes
+            body = _encode(payload)
 
-            # 2. Serialize JSON
-            json_data = json.dumps(payload)
+            # 2. Compress large (batched) payloads - repetitive JSON shrinks well
+            headers = self.headers
+            plain = None  # Uncompressed body, kept for the fallback below
+            if self._gzip and len(body) > GZIP_MIN_SIZE:
+                plain = body
+                body = gzip.compress(body, compresslevel=3)
+                headers = {**self.headers, "Content-Encoding": "gzip"}
 
-            # 3. Send Request
             endpoint = f"{self.base_path}/rest/v1/{table}"
-            conn.request("POST", endpoint, json_data, self.headers)
-
-            # 4. Get Response
-            response = conn.getresponse()
+        except Exception as e:
+            logger.error(f"Failed to encode payload: {e}")
+            return False
 
-            # 5. Check Status (201 Created is success for insert)
-            if response.status in (200, 201):
-                # Consume body to clear connection
-                response.read()
-                return True
-            else:
-                logger.error(
-                    f"HTTP Error {response.status}: {response.read().decode()}"
+        for attempt in range(POST_RETRIES + 1):
+            if attempt:
+                if not self._breaker.allow():
+                    return False
+                time.sleep(
+                    min(POST_BACKOFF_MAX, POST_BACKOFF * (2 ** (attempt - 1)))
+                    * random.uniform(0.5, 1.5)
                 )
+
+            try:
+                # 3. Send Request (reuses the open TCP/TLS connection)
+                status, data = self._request("POST", endpoint, body, headers)
+                if status in _GZIP_REJECTED and plain is not None:
+                    # Server (or a proxy) refused the compressed body
+                    logger.warning(f"HTTP {status} for gzip body, resending uncompressed")
+                    body, headers, plain = plain, self.headers, None
+                    status, data = self._request("POST", endpoint, body, headers)
+                    if status in (200, 201):
+                        logger.warning("Server rejects gzip bodies, no longer compressing")
+                        self._gzip = False
+            except OSError as e:
+                # Refused/reset/timed out. A failed POST would be resent by
+                # the next sync pass anyway, so retrying now adds no risk
+                logger.warning(f"Connection failed (attempt {attempt + 1}): {e}")
+                self._breaker.record(False)
+                continue
+            except Exception as e:
+                logger.error(f"Connection failed: {e}")
+                self._breaker.record(False)
                 return False
 
-        except Exception as e:
-            logger.error(f"Connection failed: {e}")
+            # 4. Check Status (201 Created is success for insert)
+            if status in (200, 201):
+                self._breaker.record(True)
+                return True
+
+            # Only server-side errors indicate the backend is struggling
+            self._breaker.record(status < 500)
+            if status in _RETRY_STATUSES:
+                logger.warning(f"HTTP {status} (attempt {attempt + 1}), retrying")
+                continue
+
+            logger.error(f"HTTP Error {status}: {data.decode()}")
             return False
-        finally:
-            if conn:
-                conn.close()
+
+        logger.error(f"POST to {table} failed after {POST_RETRIES + 1} attempts")
+        return False
 
     def insert_reading(self, reading_data: Dict[str, Any]) -> bool:
         """
@@ -141,33 +423,54 @@ class SupabaseClient:
         Args:
             reading_data: Dictionary matching table schema
         """
-        return self._post("readings", self._clean_data(reading_data))
+        return self.insert_readings([reading_data])
+
+    def insert_readings(self, rows: List[Mapping[str, Any]]) -> bool:
+        """
+        Send many sensor readings to the 'readings' table in one POST.
+
+        PostgREST accepts a JSON array for bulk insert, so N readings cost
+        one request/round-trip instead of N.
+
+        Args:
+            rows: Dicts or sqlite3.Row objects matching table schema
+        """
+        if not rows:
+            return True
+
+        payload = [self._clean_data(r) for r in rows]
+        return self._post("readings", payload)
 
     def insert_batch(self, readings_data: List[Dict[str, Any]]) -> bool:
         """
         Send a batch of sensor readings to the 'readings' table.
-        This is more efficient than sending one by one.
+        Alias of insert_readings() kept for existing callers.
 
         Args:
             readings_data: List of dictionaries matching table schema
         """
-        if not readings_data:
-            return True
-            
-        cleaned_batch = [self._clean_data(r) for r in readings_data]
-        return self._post("readings", cleaned_batch)
-
-    def _clean_data(self, reading_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Helper to format data for Supabase schema"""
-        data = reading_data.copy()
-        
-        # Standardize timestamp
-        if 'timestamp' in data:
-            data['created_at'] = data.pop('timestamp', None)
-        
-        # Whitelist keys
-        allowed_keys = ['created_at', 'device_id', 'user_id', 'voltage', 'force_percent', 'state', 'variance']
-        return {k: v for k, v in data.items() if k in allowed_keys}
+        return self.insert_readings(readings_data)
+
+    def _clean_data(self, reading_data: Mapping[str, Any]) -> Dict[str, Any]:
+        """Helper to format data for Supabase schema (dict or sqlite3.Row)"""
+        # Whitelist keys (Row's `in` tests values, so check against keys())
+        keys = reading_data.keys()
+        data = {k: reading_data[k] for k in _ALLOWED_KEYS if k in keys}
+        for k, places in _UPLOAD_PRECISION.items():
+            value = data.get(k)
+            if isinstance(value, float):
+                data[k] = round(value, places)
+
+        # Standardize timestamp (local store keeps unix microseconds)
+        if "timestamp" in keys:
+            timestamp = reading_data["timestamp"]
+            if isinstance(timestamp, int):
+                timestamp = datetime.fromtimestamp(
+                    timestamp / 1_000_000, timezone.utc
+                ).isoformat()
+            data["created_at"] = timestamp
+
+        return data
 
     def fetch_history(self, days: int = 7, user_id: Optional[str] = None) -> List[Dict]:
         """
@@ -184,7 +487,6 @@ class SupabaseClient:
         """
         # Build PostgREST filter
         # gte. = greater than or equal, iso format for timestamp
-        from datetime import datetime, timedelta
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
         
         # Construct query params
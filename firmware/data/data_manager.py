@@ -6,15 +6,59 @@ Meets specification #23: System remains functional when data connectivity is los
 
 import json
 import logging
+import queue
+import random
 import sqlite3
+import threading
 import time
-from datetime import datetime, timedelta
+from collections import deque
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def _dumps(obj: Any) -> str:
+    """Serialize to compact JSON (orjson when available, else stdlib)"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+# Timestamps are stored as INTEGER unix microseconds
+US_PER_SEC = 1_000_000
+US_PER_DAY = 86400 * US_PER_SEC
+
+
+def _now_us() -> int:
+    """Current time as unix microseconds"""
+    return time.time_ns() // 1000
+
+
+def _iso(us: int) -> str:
+    """Format unix microseconds as an ISO-8601 UTC string"""
+    return datetime.fromtimestamp(us / US_PER_SEC, timezone.utc).isoformat()
+
+
+# (epoch second, ISO string) of the last _now_iso() call
+_iso_cache = (0, "")
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO string, re-formatted at most once a second"""
+    global _iso_cache
+    sec = int(time.time())
+    if sec != _iso_cache[0]:
+        _iso_cache = (sec, _iso(sec * US_PER_SEC))
+    return _iso_cache[1]
+
+
 class DataManagerError(Exception):
     """Custom exception for DataManager errors"""
 
@@ -27,6 +71,7 @@ class DataManager:
 
     Features:
     - SQLite local storage for offline functionality (spec #23)
+    - Batched inserts over long-lived per-thread WAL connections
     - 30-day data retention with automatic cleanup
     - JSON serialization for MQTT transmission
     - Calibration data persistence
@@ -47,6 +92,65 @@ class DataManager:
     # In-memory queue size (for SQLite failures)
     MAX_QUEUE_SIZE = 1000
 
+    # Decimal places kept for numeric fields in JSON payloads
+    # (variance is small-valued, so it keeps more digits)
+    JSON_PRECISION = 4
+    VARIANCE_PRECISION = 6
+
+    # Write batching: flush buffered readings once this many are pending...
+    BATCH_SIZE = 50
+
+    # ...or once this many seconds have passed since the last flush
+    FLUSH_INTERVAL = 1.0
+
+    # Default spacing of the samples in a store_readings() group (10 Hz)
+    READING_PERIOD_US = 100_000
+
+    # Max jobs waiting for the worker; beyond this new readings are dropped
+    # rather than blocking the sampling thread
+    WORKER_QUEUE_SIZE = 1024
+
+    # Cleanup deletes at most this many rows per statement (keeps SD writes small)
+    CLEANUP_CHUNK = 1000
+
+    # Free pages returned to the filesystem per cleanup
+    VACUUM_PAGES = 1000
+    SCHEMA_VERSION = 5  # Bump when _init_db DDL changes
+    RETRY_BASE_WAIT = 0.1  # seconds
+    RETRY_MAX_WAIT = 5.0  # seconds
+
+    # Connection-level tuning applied once when the database is opened.
+    # page_size and auto_vacuum must come first: they only take effect on a
+    # new, empty file (before WAL is enabled). mmap_size lets reads use the
+    # mapped file instead of copying pages into the page cache.
+    PRAGMAS = (
+        "PRAGMA page_size=8192",
+        "PRAGMA auto_vacuum=INCREMENTAL",
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-8000",
+        "PRAGMA mmap_size=268435456",
+    )
+
+    # Every insert path binds this exact string, so each connection's
+    # statement cache compiles it once and reuses the prepared statement
+    # State names are stored as small integer codes from the states table
+    INSERT_SQL = """
+        INSERT INTO readings
+        (timestamp, voltage, force_percent, state, variance, device_id, user_id)
+        VALUES (?, ?, ?, (SELECT code FROM states WHERE name = ?), ?, ?, ?)
+    """
+
+    MARK_SYNCED_SQL = """
+        DELETE FROM unsynced
+        WHERE id IN (SELECT value FROM json_each(?))
+    """
+
+    MARK_SYNCED_THROUGH_SQL = """
+        DELETE FROM unsynced WHERE id <= ?
+    """
+
     def __init__(
         self,
         db_path: str = "sleepsense.db",
@@ -65,66 +169,236 @@ class DataManager:
         self.device_id = device_id
         self.user_id = user_id
 
+        # Constant tail of every to_json payload, serialized once
+        self._json_tail = (
+            f',"sensor_type":"fsr408","channel":0,'
+            f'"device_id":{_dumps(device_id)},"user_id":{_dumps(user_id)}}}'
+        )
+
         # Insert counter for cleanup scheduling
         self._insert_count = 0
 
         # In-memory queue for offline buffering when SQLite fails
-        self._memory_queue: List[Dict] = []
+        # (bounded FIFO: once full, the oldest reading is dropped)
+        self._memory_queue: Deque[Dict] = deque(maxlen=self.MAX_QUEUE_SIZE)
+
+        # Readings waiting to be written in the next batch
+        self._pending: List[tuple] = []
+        self._last_flush = time.monotonic()
+
+        # State names already present in the states table (worker thread)
+        self._known_states: set = set()
+
+        self._last_write_ok = True
+
+        # One long-lived connection per thread (autocommit; transactions are
+        # explicit). With WAL, readers on the sync/caller thread never block
+        # the worker's inserts and vice versa, so no Python-level lock.
+        self._tls = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
 
         # Initialize database
         self._init_db()
 
-        logger.info(f"DataManager initialized: {db_path}")
+        # Background worker: owns batched inserts, cleanup and submitted jobs
+        # so the sampling thread never blocks on disk or network I/O
+        self._worker_q: "queue.Queue[tuple]" = queue.Queue(
+            maxsize=self.WORKER_QUEUE_SIZE
+        )
+        self._dropped = 0
+        self._worker = threading.Thread(
+            target=self._worker_loop, name="DataManagerWorker", daemon=True
+        )
+        self._worker.start()
+
+        # Confirm the PRAGMAs took (WAL silently stays off on some filesystems)
+        self.journal_mode = self._c().execute("PRAGMA journal_mode").fetchone()[0]
+
+        logger.info(f"DataManager initialized: {db_path} (journal_mode={self.journal_mode})")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite connection and apply performance PRAGMAs"""
+        try:
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None
+            )
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+            return conn
+
+        except sqlite3.Error as e:
+            logger.error(f"Database connection failed: {e}")
+            raise DataManagerError(f"Failed to open database: {e}")
+
+    def _c(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._tls.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
 
     def _init_db(self):
         """Initialize SQLite database with schema"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-
-                # Sensor readings table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS readings (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        voltage REAL,
-                        force_percent REAL,
-                        state TEXT,
-                        variance REAL,
-                        synced BOOLEAN DEFAULT 0,
-                        device_id TEXT DEFAULT 'rpi_node_1',
-                        user_id TEXT DEFAULT 'user_001'
-                    )
-                """)
+            conn = self._c()
+            cursor = conn.cursor()
+
+            # Warm start: schema already at this version, skip the DDL
+            cursor.execute("PRAGMA user_version")
+            version = cursor.fetchone()[0]
+            if version >= self.SCHEMA_VERSION:
+                return
+
+            cursor.execute("BEGIN IMMEDIATE")
+
+            # Indexes are (re)built below for the current version
+            for index in (
+                "idx_timestamp",
+                "idx_synced",
+                "idx_synced_cover",
+                "idx_user_device",
+            ):
+                cursor.execute(f"DROP INDEX IF EXISTS {index}")
+
+            # Older layouts are rebuilt: v2 made timestamps INTEGER
+            # microseconds, v4 moved the synced flag out, v5 stores state
+            # as an INTEGER code. Move the old rows aside and copy them in.
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'readings'"
+            )
+            migrate = cursor.fetchone() is not None
+            if migrate:
+                cursor.execute("ALTER TABLE readings RENAME TO readings_old")
+
+            # Sensor readings table (timestamp = unix microseconds,
+            # state = states.code)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS readings (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp INTEGER NOT NULL DEFAULT (
+                        CAST(ROUND((julianday('now') - 2440587.5) * 86400000) AS INTEGER) * 1000
+                    ),
+                    voltage REAL,
+                    force_percent REAL,
+                    state INTEGER,
+                    variance REAL,
+                    device_id TEXT DEFAULT 'rpi_node_1',
+                    user_id TEXT DEFAULT 'user_001'
+                )
+            """)
 
-                # Calibration table (single row)
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS calibration (
-                        id INTEGER PRIMARY KEY CHECK (id = 1),
-                        baseline_voltage REAL,
-                        occupied_threshold REAL,
-                        movement_threshold REAL,
-                        calibrated_at DATETIME
+            # Sleep state names, one row per distinct state
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS states (
+                    code INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE
+                )
+            """)
+
+            # IDs of readings not yet synced. readings stays insert-only and
+            # this table stays as small as the sync backlog.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS unsynced (id INTEGER PRIMARY KEY)
+            """)
+
+            if migrate:
+                cursor.execute("PRAGMA table_info(readings_old)")
+                old_columns = {col[1] for col in cursor.fetchall()}
+
+                if version < 2:
+                    # Old DATETIME text (UTC from CURRENT_TIMESTAMP) ->
+                    # microseconds, rounded to the millisecond julianday()
+                    # can represent
+                    timestamp = (
+                        "CAST(ROUND((julianday(timestamp) - 2440587.5) * 86400000)"
+                        " AS INTEGER) * 1000"
                     )
-                """)
+                    where = "WHERE julianday(timestamp) IS NOT NULL"
+                else:
+                    timestamp = "timestamp"
+                    where = ""
 
-                # Indexes for performance
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_timestamp ON readings(timestamp)
-                """)
                 cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_synced ON readings(synced)
-                    WHERE synced = 0
+                    INSERT OR IGNORE INTO states (name)
+                    SELECT DISTINCT state FROM readings_old
+                    WHERE state IS NOT NULL
                 """)
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_user_device
-                    ON readings(user_id, device_id)
+                cursor.execute(f"""
+                    INSERT INTO readings
+                    (id, timestamp, voltage, force_percent, state, variance,
+                     device_id, user_id)
+                    SELECT id, {timestamp}, voltage, force_percent,
+                           (SELECT code FROM states WHERE name = o.state),
+                           variance, device_id, user_id
+                    FROM readings_old o
+                    {where}
                 """)
-
-                conn.commit()
-                logger.info("Database schema initialized")
+                if "synced" in old_columns:
+                    cursor.execute(f"""
+                        INSERT OR IGNORE INTO unsynced (id)
+                        SELECT id FROM readings_old
+                        {where + " AND" if where else "WHERE"} synced = 0
+                    """)
+                cursor.execute("DROP TABLE readings_old")
+                logger.info(f"Migrated readings from schema version {version}")
+
+            # Keep unsynced in step with readings (created after the
+            # migration copies so copied rows keep their synced state)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS readings_unsynced_insert
+                AFTER INSERT ON readings
+                BEGIN
+                    INSERT INTO unsynced (id) VALUES (NEW.id);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS readings_unsynced_delete
+                AFTER DELETE ON readings
+                BEGIN
+                    DELETE FROM unsynced WHERE id = OLD.id;
+                END
+            """)
+
+            # Calibration table (single row)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS calibration (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    baseline_voltage REAL,
+                    occupied_threshold REAL,
+                    movement_threshold REAL,
+                    calibrated_at DATETIME
+                )
+            """)
+
+            # Indexes for performance
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_timestamp ON readings(timestamp)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_user_device
+                ON readings(user_id, device_id)
+            """)
+
+            cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            cursor.execute("COMMIT")
+
+            if migrate:
+                # One-off compaction after the rebuild: returns the old table's
+                # pages to the filesystem and applies auto_vacuum to databases
+                # created before it was set
+                try:
+                    cursor.execute("VACUUM")
+                except sqlite3.Error as e:
+                    logger.warning(f"Post-migration VACUUM skipped: {e}")
+            logger.info(f"Database schema initialized (version {self.SCHEMA_VERSION})")
 
         except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.rollback()
             logger.error(f"Database initialization failed: {e}")
             raise DataManagerError(f"Failed to initialize database: {e}")
 
@@ -144,8 +418,12 @@ class DataManager:
                 return operation()
             except sqlite3.OperationalError as e:
                 if "database is locked" in str(e) and attempt < max_retries - 1:
-                    wait_time = 0.1 * (attempt + 1)
-                    logger.warning(f"Database locked, retrying in {wait_time}s...")
+                    # Exponential backoff with jitter so contending writers
+                    # don't retry in lockstep
+                    wait_time = min(
+                        self.RETRY_MAX_WAIT, self.RETRY_BASE_WAIT * (2**attempt)
+                    ) * random.uniform(0.5, 1.5)
+                    logger.warning(f"Database locked, retrying in {wait_time:.2f}s...")
                     time.sleep(wait_time)
                 else:
                     raise
@@ -158,7 +436,10 @@ class DataManager:
         """
         Store sensor reading to SQLite.
 
-        If SQLite fails, stores in memory queue for later flush.
+        The reading is handed to the background worker and this call returns
+        immediately. The worker writes in batches (every BATCH_SIZE readings
+        or FLUSH_INTERVAL seconds) so one commit covers many samples; if a
+        batch write fails, it moves to the memory queue for later flush.
 
         Args:
             voltage: Voltage reading
@@ -166,90 +447,281 @@ class DataManager:
             state: Sleep state string
             variance: Movement variance
 
+        Returns:
+            True once queued, False if the worker is backed up and the
+            reading was dropped
+        """
+        row = (
+            _now_us(),
+            voltage,
+            force_percent,
+            state,
+            variance,
+            self.device_id,
+            self.user_id,
+        )
+        return self._enqueue(("insert", row), 1)
+
+    def store_readings(
+        self,
+        readings: Sequence[Tuple[float, float, str, float]],
+        period_us: Optional[int] = None,
+        end_us: Optional[int] = None,
+    ) -> bool:
+        """
+        Store several sensor readings with a single hand-off to the worker.
+
+        Same as calling store_reading for each, but the whole group costs
+        one queue operation and lands in the same batch transaction. The
+        readings are consecutive samples: the last is stamped end_us and
+        each earlier one is back-dated by period_us per sample.
+
+        Args:
+            readings: (voltage, force_percent, state, variance) tuples,
+                      oldest first
+            period_us: Microseconds between samples (None = READING_PERIOD_US)
+            end_us: Unix microseconds of the last reading (None = now)
+
+        Returns:
+            True once queued, False if the worker is backed up and the
+            readings were dropped
+        """
+        if not readings:
+            return True
+        if period_us is None:
+            period_us = self.READING_PERIOD_US
+        if end_us is None:
+            end_us = _now_us()
+        start = end_us - (len(readings) - 1) * period_us
+        rows = [
+            (
+                start + i * period_us,
+                voltage,
+                force_percent,
+                state,
+                variance,
+                self.device_id,
+                self.user_id,
+            )
+            for i, (voltage, force_percent, state, variance) in enumerate(readings)
+        ]
+        return self._enqueue(("insert_many", rows), len(rows))
+
+    def _enqueue(self, job: tuple, count: int) -> bool:
+        """Queue readings for the worker without ever blocking the caller"""
+        if not self._worker.is_alive():
+            # Closed: nothing drains the queue, buffer for the next flush()
+            kind, payload = job
+            if kind == "insert":
+                self._pending.append(payload)
+            else:
+                self._pending.extend(payload)
+            return True
+
+        try:
+            self._worker_q.put_nowait(job)
+            return True
+        except queue.Full:
+            self._dropped += count
+            if self._dropped == count or self._dropped % 100 < count:
+                logger.warning(
+                    f"Worker backlog full, dropped {self._dropped} readings so far"
+                )
+            return False
+
+    def submit(self, job: Callable[[], Any]) -> bool:
+        """
+        Run a callable on the background worker thread.
+
+        Use for slow database housekeeping so the caller never blocks on
+        disk I/O. If the worker is backed up the job is dropped rather than
+        waited for; after close() it runs on the caller's thread instead.
+
+        Args:
+            job: Function taking no arguments
+
+        Returns:
+            True once queued (or run), False if the job was dropped
+        """
+        if not self._worker.is_alive():
+            job()
+            return True
+        try:
+            self._worker_q.put_nowait(("call", job))
+            return True
+        except queue.Full:
+            logger.warning("Worker backlog full, dropped a submitted job")
+            return False
+
+    def flush(self) -> bool:
+        """
+        Write all buffered readings to SQLite and wait for completion.
+
+        After close() the worker is gone, so the write happens on the
+        caller's thread rather than waiting on a queue nobody drains.
+
+        Returns:
+            True if stored successfully, False otherwise
+        """
+        if (
+            threading.current_thread() is self._worker
+            or not self._worker.is_alive()
+        ):
+            return self._write_pending()
+
+        self._worker_q.put(("flush", None))
+        self._worker_q.join()
+        return self._last_write_ok
+
+    def _worker_loop(self):
+        """Worker thread: process queued inserts, flushes, cleanup and jobs"""
+        while True:
+            try:
+                kind, payload = self._worker_q.get(timeout=self.FLUSH_INTERVAL)
+            except queue.Empty:
+                # Idle: make sure a partial batch doesn't sit in memory
+                self._write_pending()
+                continue
+
+            try:
+                if kind in ("insert", "insert_many"):
+                    if kind == "insert":
+                        self._pending.append(payload)
+                    else:
+                        self._pending.extend(payload)
+                    if (
+                        len(self._pending) >= self.BATCH_SIZE
+                        or time.monotonic() - self._last_flush > self.FLUSH_INTERVAL
+                    ):
+                        self._write_pending()
+                elif kind == "flush":
+                    self._write_pending()
+                elif kind == "cleanup":
+                    self.cleanup_old_data()
+                elif kind == "call":
+                    payload()
+                elif kind == "stop":
+                    self._write_pending()
+                    return
+            except Exception as e:
+                logger.error(f"DataManager worker job '{kind}' failed: {e}")
+            finally:
+                self._worker_q.task_done()
+
+    def _write_pending(self) -> bool:
+        """
+        Write buffered readings in a single transaction (worker thread only).
+
         Returns:
             True if stored successfully, False otherwise
         """
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            self._last_write_ok = True
+            return True
+
+        batch, self._pending = self._pending, []
 
         def _insert():
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO readings
-                    (voltage, force_percent, state, variance, device_id, user_id, synced)
-                    VALUES (?, ?, ?, ?, ?, ?, 0)
-                """,
-                    (
-                        voltage,
-                        force_percent,
-                        state,
-                        variance,
-                        self.device_id,
-                        self.user_id,
-                    ),
-                )
-                conn.commit()
-                return True
+            conn = self._c()
+            conn.execute("BEGIN")
+            try:
+                self._register_states(conn, {row[3] for row in batch})
+                conn.executemany(self.INSERT_SQL, batch)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return True
 
         try:
             result = self._execute_with_retry(_insert)
-            self._insert_count += 1
+            self._insert_count += len(batch)
 
-            # Periodic cleanup
+            # Periodic cleanup, scheduled as its own job on this thread
+            # (never block here: this thread is the one draining the queue)
             if self._insert_count >= self.CLEANUP_INTERVAL:
-                self.cleanup_old_data()
-                self._insert_count = 0
+                try:
+                    self._worker_q.put_nowait(("cleanup", None))
+                    self._insert_count = 0
+                except queue.Full:
+                    pass
 
             # Flush memory queue if any
             if self._memory_queue:
                 self._flush_memory_queue()
 
+            self._last_write_ok = result
             return result
 
         except Exception as e:
-            logger.error(f"Failed to store reading to SQLite: {e}")
+            logger.error(f"Failed to store readings to SQLite: {e}")
             # Store in memory queue for later
-            if len(self._memory_queue) < self.MAX_QUEUE_SIZE:
+            for timestamp, voltage, force_percent, state, variance, _, _ in batch:
                 self._memory_queue.append(
                     {
                         "voltage": voltage,
                         "force_percent": force_percent,
                         "state": state,
                         "variance": variance,
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": timestamp,
                     }
                 )
-                logger.warning(
-                    f"Stored in memory queue (size: {len(self._memory_queue)})"
-                )
+            logger.warning(
+                f"Stored in memory queue (size: {len(self._memory_queue)})"
+            )
+            self._last_write_ok = False
             return False
 
+    def _register_states(self, conn: sqlite3.Connection, names: set):
+        """
+        Make sure every state name has a code before rows referencing it
+        are inserted (worker thread, inside the insert transaction).
+
+        Args:
+            conn: Connection with the open transaction
+            names: State names used by the rows about to be inserted
+        """
+        new = names - self._known_states
+        new.discard(None)
+        if new:
+            conn.executemany(
+                "INSERT OR IGNORE INTO states (name) VALUES (?)",
+                [(name,) for name in new],
+            )
+            self._known_states |= new
+
     def _flush_memory_queue(self):
         """Flush in-memory queue to SQLite"""
         if not self._memory_queue:
             return
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                for item in self._memory_queue:
-                    cursor.execute(
-                        """
-                        INSERT INTO readings
-                        (voltage, force_percent, state, variance, timestamp, device_id, user_id, synced)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, 0)
-                    """,
+            conn = self._c()
+            conn.execute("BEGIN")
+            try:
+                self._register_states(
+                    conn, {item["state"] for item in self._memory_queue}
+                )
+                conn.executemany(
+                    self.INSERT_SQL,
+                    [
                         (
+                            item["timestamp"],
                             item["voltage"],
                             item["force_percent"],
                             item["state"],
                             item["variance"],
-                            item["timestamp"],
                             self.device_id,
                             self.user_id,
-                        ),
-                    )
-                conn.commit()
+                        )
+                        for item in self._memory_queue
+                    ],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
 
             logger.info(f"Flushed {len(self._memory_queue)} items from memory queue")
             self._memory_queue.clear()
@@ -257,7 +729,29 @@ class DataManager:
         except Exception as e:
             logger.error(f"Failed to flush memory queue: {e}")
 
-    def get_unsynced_readings(self, limit: int = 100) -> List[Dict]:
+    def close(self):
+        """Flush buffered readings, stop the worker and close all connections"""
+        if self._worker.is_alive():
+            # NORMAL can lose the last commit on power loss; make the final
+            # flush fully durable
+            self._worker_q.put(
+                ("call", lambda: self._c().execute("PRAGMA synchronous=FULL"))
+            )
+            self._worker_q.put(("stop", None))
+            self._worker.join()
+        try:
+            with self._conns_lock:
+                for conn in self._conns:
+                    conn.close()
+                self._conns.clear()
+            self._tls = threading.local()
+            logger.info("DataManager connections closed")
+        except sqlite3.Error as e:
+            logger.warning(f"Error closing database: {e}")
+
+    def get_unsynced_readings(
+        self, limit: int = 100, after_id: int = 0
+    ) -> List[sqlite3.Row]:
         """
         Get readings that haven't been synced to remote server.
 
@@ -265,29 +759,34 @@ class DataManager:
 
         Args:
             limit: Maximum number of readings to return
+            after_id: Only return readings with a larger ID (keyset paging,
+                so the next page can be read before this one is marked)
 
         Returns:
-            List of unsynced readings as dictionaries
+            List of unsynced readings as sqlite3.Row (by-name access, e.g.
+            row["id"]; use dict(row) if a real dict is needed)
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                cursor.execute(
-                    """
-                    SELECT id, timestamp, voltage, force_percent, state, variance,
-                           device_id, user_id
-                    FROM readings
-                    WHERE synced = 0
-                    ORDER BY timestamp ASC
-                    LIMIT ?
-                """,
-                    (limit,),
-                )
-
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+            self.flush()
+            cursor = self._c().cursor()
+            cursor.row_factory = sqlite3.Row
+
+            cursor.execute(
+                """
+                SELECT r.id, r.timestamp, r.voltage, r.force_percent,
+                       s.name AS state, r.variance, r.device_id, r.user_id
+                FROM unsynced u
+                JOIN readings r ON r.id = u.id
+                LEFT JOIN states s ON s.code = r.state
+                WHERE u.id > ?
+                ORDER BY u.id ASC
+                LIMIT ?
+            """,
+                (after_id, limit),
+            )
+
+            # sqlite3.Row gives C-level by-name access without a dict per row
+            return cursor.fetchall()
 
         except Exception as e:
             logger.error(f"Failed to get unsynced readings: {e}")
@@ -297,6 +796,9 @@ class DataManager:
         """
         Mark readings as synced after successful MQTT transmission.
 
+        IDs are bound as a single JSON array parameter, so the statement is
+        parsed once and is not limited by SQLite's host-parameter count.
+
         Args:
             ids: List of reading IDs to mark as synced
 
@@ -307,19 +809,35 @@ class DataManager:
             return True
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                placeholders = ",".join("?" * len(ids))
-                cursor.execute(
-                    f"""
-                    UPDATE readings SET synced = 1
-                    WHERE id IN ({placeholders})
-                """,
-                    ids,
-                )
-                conn.commit()
+            cursor = self._c().cursor()
+            cursor.execute(self.MARK_SYNCED_SQL, (json.dumps(ids),))
+
+            logger.debug("Marked %d readings as synced", len(ids))
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to mark readings as synced: {e}")
+            return False
+
+    def mark_synced_through(self, max_id: int) -> bool:
+        """
+        Mark every unsynced reading with id <= max_id as synced.
+
+        get_unsynced_readings returns the lowest unsynced IDs in order and
+        IDs only grow, so a batch it returned is exactly the unsynced rows
+        up to its largest ID: one range DELETE, no ID list to bind.
+
+        Args:
+            max_id: Largest reading ID in the uploaded batch
 
-            logger.debug(f"Marked {len(ids)} readings as synced")
+        Returns:
+            True if successful
+        """
+        try:
+            cursor = self._c().cursor()
+            cursor.execute(self.MARK_SYNCED_THROUGH_SQL, (max_id,))
+
+            logger.debug("Marked %d readings as synced", cursor.rowcount)
             return True
 
         except Exception as e:
@@ -340,33 +858,39 @@ class DataManager:
             List of readings as dictionaries
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                if hours:
-                    since = datetime.now() - timedelta(hours=hours)
-                    cursor.execute(
-                        """
-                        SELECT * FROM readings
-                        WHERE timestamp > ?
-                        ORDER BY timestamp DESC
-                        LIMIT ?
-                    """,
-                        (since.isoformat(), limit),
-                    )
-                else:
-                    cursor.execute(
-                        """
-                        SELECT * FROM readings
-                        ORDER BY timestamp DESC
-                        LIMIT ?
-                    """,
-                        (limit,),
-                    )
+            self.flush()
+            cursor = self._c().cursor()
+            cursor.row_factory = sqlite3.Row
+
+            if hours:
+                since = _now_us() - hours * 3600 * US_PER_SEC
+                cursor.execute(
+                    """
+                    SELECT r.id, r.timestamp, r.voltage, r.force_percent,
+                           s.name AS state, r.variance, r.device_id, r.user_id
+                    FROM readings r
+                    LEFT JOIN states s ON s.code = r.state
+                    WHERE r.timestamp > ?
+                    ORDER BY r.timestamp DESC
+                    LIMIT ?
+                """,
+                    (since, limit),
+                )
+            else:
+                cursor.execute(
+                    """
+                    SELECT r.id, r.timestamp, r.voltage, r.force_percent,
+                           s.name AS state, r.variance, r.device_id, r.user_id
+                    FROM readings r
+                    LEFT JOIN states s ON s.code = r.state
+                    ORDER BY r.timestamp DESC
+                    LIMIT ?
+                """,
+                    (limit,),
+                )
 
-                rows = cursor.fetchall()
-                return [dict(row) for row in rows]
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows]
 
         except Exception as e:
             logger.error(f"Failed to get recent readings: {e}")
@@ -390,22 +914,20 @@ class DataManager:
             True if successful
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-
-                # Use REPLACE to handle single-row constraint
-                cursor.execute(
-                    """
-                    REPLACE INTO calibration
-                    (id, baseline_voltage, occupied_threshold, movement_threshold, calibrated_at)
-                    VALUES (1, ?, ?, ?, datetime('now'))
-                """,
-                    (baseline_voltage, occupied_threshold, movement_threshold),
-                )
-
-                conn.commit()
-                logger.info("Calibration saved to database")
-                return True
+            cursor = self._c().cursor()
+
+            # Use REPLACE to handle single-row constraint
+            cursor.execute(
+                """
+                REPLACE INTO calibration
+                (id, baseline_voltage, occupied_threshold, movement_threshold, calibrated_at)
+                VALUES (1, ?, ?, ?, datetime('now'))
+            """,
+                (baseline_voltage, occupied_threshold, movement_threshold),
+            )
+
+            logger.info("Calibration saved to database")
+            return True
 
         except Exception as e:
             logger.error(f"Failed to save calibration: {e}")
@@ -419,16 +941,15 @@ class DataManager:
             Dictionary with calibration data or None if not found
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
+            cursor = self._c().cursor()
+            cursor.row_factory = sqlite3.Row
 
-                cursor.execute("SELECT * FROM calibration WHERE id = 1")
-                row = cursor.fetchone()
+            cursor.execute("SELECT * FROM calibration WHERE id = 1")
+            row = cursor.fetchone()
 
-                if row:
-                    return dict(row)
-                return None
+            if row:
+                return dict(row)
+            return None
 
         except Exception as e:
             logger.error(f"Failed to load calibration: {e}")
@@ -438,43 +959,56 @@ class DataManager:
         """
         Remove data older than retention period (30 days).
 
+        Deletes in CLEANUP_CHUNK-sized statements and reclaims only the freed
+        pages (incremental vacuum) instead of rewriting the whole file.
+
         Returns:
             Number of records deleted
         """
-        cutoff = datetime.now() - timedelta(days=self.RETENTION_DAYS)
+        cutoff = _now_us() - self.RETENTION_DAYS * US_PER_DAY
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            conn = self._c()
+            cursor = conn.cursor()
 
+            deleted = 0
+            while True:
                 cursor.execute(
                     """
-                    DELETE FROM readings
-                    WHERE timestamp < ?
+                    DELETE FROM readings WHERE id IN (
+                        SELECT id FROM readings
+                        WHERE timestamp < ?
+                        LIMIT ?
+                    )
                 """,
-                    (cutoff.isoformat(),),
+                    (cutoff, self.CLEANUP_CHUNK),
                 )
+                deleted += cursor.rowcount
+                if cursor.rowcount < self.CLEANUP_CHUNK:
+                    break
 
-                deleted = cursor.rowcount
-                conn.commit()
-
-                if deleted > 0:
-                    logger.info(
-                        f"Cleaned up {deleted} old records (older than {self.RETENTION_DAYS} days)"
-                    )
+            if deleted > 0:
+                logger.info(
+                    f"Cleaned up {deleted} old records (older than {self.RETENTION_DAYS} days)"
+                )
 
-                # Vacuum to reclaim space
-                cursor.execute("VACUUM")
+                # Reclaim freed pages (executescript steps the pragma to completion)
+                conn.executescript(
+                    f"PRAGMA incremental_vacuum({self.VACUUM_PAGES});"
+                )
 
-                return deleted
+            return deleted
 
         except Exception as e:
             logger.error(f"Failed to cleanup old data: {e}")
             return 0
 
-    def to_json(self, reading: Dict) -> str:
+    def to_json(self, reading: Union[Dict, sqlite3.Row]) -> str:
         """
-        Convert reading to JSON format for MQTT transmission.
+        Convert reading to compact JSON format for MQTT transmission.
+
+        Numeric fields are rounded (JSON_PRECISION / VARIANCE_PRECISION
+        decimals) to keep the payload small on the wire.
 
         JSON Schema:
         {
@@ -490,24 +1024,30 @@ class DataManager:
         }
 
         Args:
-            reading: Dictionary with sensor reading data
+            reading: Dictionary with sensor reading data, or a row from
+                     get_unsynced_readings()
 
         Returns:
             JSON string
         """
-        payload = {
-            "timestamp": reading.get("timestamp", datetime.now().isoformat()),
-            "sensor_type": "fsr408",
-            "channel": 0,
-            "voltage": reading.get("voltage", 0.0),
-            "force_percent": reading.get("force_percent", 0.0),
-            "state": reading.get("state", "Unknown"),
-            "variance": reading.get("variance", 0.0),
-            "device_id": self.device_id,
-            "user_id": self.user_id,
-        }
-
-        return json.dumps(payload, indent=2)
+        if isinstance(reading, sqlite3.Row):
+            reading = dict(reading)
+
+        # Only the per-reading fields are serialized here; device/sensor
+        # fields come from the prebuilt _json_tail
+        timestamp = reading.get("timestamp") or _now_iso()
+        if isinstance(timestamp, int):
+            timestamp = _iso(timestamp)
+        voltage = float(round(reading.get("voltage", 0.0), self.JSON_PRECISION))
+        force = float(round(reading.get("force_percent", 0.0), self.JSON_PRECISION))
+        variance = float(round(reading.get("variance", 0.0), self.VARIANCE_PRECISION))
+        state = reading.get("state", "Unknown")
+
+        return (
+            f'{{"timestamp":{_dumps(timestamp)},"voltage":{voltage!r},'
+            f'"force_percent":{force!r},"state":{_dumps(state)},'
+            f'"variance":{variance!r}{self._json_tail}'
+        )
 
     def get_stats(self) -> Dict:
         """
@@ -517,32 +1057,33 @@ class DataManager:
             Dictionary with database stats
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-
-                # Total readings
-                cursor.execute("SELECT COUNT(*) FROM readings")
-                total = cursor.fetchone()[0]
-
-                # Unsynced readings
-                cursor.execute("SELECT COUNT(*) FROM readings WHERE synced = 0")
-                unsynced = cursor.fetchone()[0]
-
-                # Database size
-                db_size = Path(self.db_path).stat().st_size
-
-                # Oldest and newest readings
-                cursor.execute("SELECT MIN(timestamp), MAX(timestamp) FROM readings")
-                min_ts, max_ts = cursor.fetchone()
-
-                return {
-                    "total_readings": total,
-                    "unsynced_readings": unsynced,
-                    "database_size_mb": round(db_size / (1024 * 1024), 2),
-                    "oldest_reading": min_ts,
-                    "newest_reading": max_ts,
-                    "memory_queue_size": len(self._memory_queue),
-                }
+            self.flush()
+            cursor = self._c().cursor()
+
+            # Total readings
+            cursor.execute("SELECT COUNT(*) FROM readings")
+            total = cursor.fetchone()[0]
+
+            # Unsynced readings
+            cursor.execute("SELECT COUNT(*) FROM unsynced")
+            unsynced = cursor.fetchone()[0]
+
+            # Database size
+            db_size = Path(self.db_path).stat().st_size
+
+            # Oldest and newest readings
+            cursor.execute("SELECT MIN(timestamp), MAX(timestamp) FROM readings")
+            min_ts, max_ts = cursor.fetchone()
+
+            return {
+                "total_readings": total,
+                "unsynced_readings": unsynced,
+                "database_size_mb": round(db_size / (1024 * 1024), 2),
+                "oldest_reading": _iso(min_ts) if min_ts is not None else None,
+                "newest_reading": _iso(max_ts) if max_ts is not None else None,
+                "memory_queue_size": len(self._memory_queue),
+                "dropped_readings": self._dropped,
+            }
 
         except Exception as e:
             logger.error(f"Failed to get stats: {e}")
@@ -592,5 +1133,6 @@ if __name__ == "__main__":
 
     # Cleanup
     dm.cleanup_old_data()
+    dm.close()
 
     print("\nTest complete!")
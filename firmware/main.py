@@ -14,31 +14,26 @@ Architecture:
 """
 
 import logging
+import logging.handlers
+import os
+import queue
 import signal
 import sys
 import time
-from collections import deque
+from array import array
 from pathlib import Path
 
 # Add parent directory to path so we can import firmware modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # === YOUR IMPLEMENTATIONS ===
-from firmware.communication.supabase_client import SupabaseClient
+# SupabaseClient (ssl/http.client) and MPU6050 are imported lazily in
+# initialize_components() to keep them off the cold-start path
 from firmware.data.data_manager import DataManager, DataManagerError
 from firmware.processing.sleep_detector import SleepDetector, SleepState
-from firmware.sensors.ads1115 import ADS1115, ADS1115Error
+from firmware.sensors.ads1115 import DR_128SPS, ADS1115, ADS1115Error
 from firmware.sensors.fsr408 import FSR408, FSR408Error
 
-# === PLACEHOLDERS FOR TEAM MEMBERS ===
-try:
-    from firmware.sensors.mpu6050 import MPU6050  # Accelerometer team
-
-    MPU6050_AVAILABLE = True
-except ImportError:
-    MPU6050_AVAILABLE = False
-    MPU6050 = None
-
 # MQTT Removed in favor of HTTP/Supabase
 MQTT_AVAILABLE = False
 
@@ -48,25 +43,106 @@ USER_ID = "user_001"
 DB_PATH = "sleepsense.db"
 I2C_BUS = 1
 ADS1115_ADDRESS = 0x48
+ADS1115_RDY_GPIO = None  # GPIO line wired to ALERT/RDY (None = timed wait)
+# Rate the movement/variance thresholds are calibrated at. Bursts are paced
+# at SAMPLE_RATE, so a faster rate only adds conversion noise
+ADS1115_DATA_RATE = DR_128SPS
 FSR_CHANNEL = 0
 
 # SUPABASE CONFIGURATION (Replace with your actual project details)
 SUPABASE_URL = "https://sntezuencvibrziosdlr.supabase.co"
 SUPABASE_KEY = "sb_publishable_5wIf1WidbsAHePKBkT1qMg_DgNgHVy5"
+# Set SLEEPSENSE_ENABLE_CLOUD=0 to run offline without loading the client
+CLOUD_ENABLED = os.environ.get("SLEEPSENSE_ENABLE_CLOUD", "1") != "0"
 
 SAMPLE_RATE = 0.1  # 10 Hz
+SAMPLE_PERIOD_US = int(SAMPLE_RATE * 1_000_000)
+BLOCK_SAMPLES = 5  # Samples per ADC burst, spaced SAMPLE_RATE apart
+BLOCK_PERIOD = SAMPLE_RATE * BLOCK_SAMPLES  # One burst every 0.5s
 SYNC_INTERVAL = (
     10  # Check for unsynced data every 10 seconds (more frequent for live feel)
 )
+SYNC_BATCH_SIZE = 100  # Readings sent per bulk POST
+SYNC_MAX_BATCHES = 20  # Upper bound on batches per sync pass
+SYNC_FETCH_TIMEOUT = 30  # Seconds to wait for the DataManager to return a page
+STATUS_EVERY = 10  # Print the status line every N samples (1 Hz at 10 Hz)
 
 # === LOGGING SETUP ===
+# The format doesn't use thread/process fields; skip collecting them per record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Log file writes are batched (100 records, or at once for warnings and up)
+# so the SD card isn't written on every INFO line
+_file_handler = logging.FileHandler("sleepsense.log", delay=True)
+_file_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+)
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout), logging.FileHandler("sleepsense.log")],
+    handlers=[
+        logging.StreamHandler(sys.stdout),
+        logging.handlers.MemoryHandler(
+            capacity=100, flushLevel=logging.WARNING, target=_file_handler
+        ),
+    ],
 )
 logger = logging.getLogger(__name__)
 
+PRE_ROLL_SAMPLES = 5  # 0.5s of pre-roll at 10Hz
+POST_ROLL_SAMPLES = 5  # 0.5s post-roll
+
+
+# Recording state is a shift register of per-sample "moving?" bits: a sample
+# is recorded while any of it and the POST_ROLL_SAMPLES before it moved
+ACTIVITY_MASK = (1 << 64) - 1
+POST_ROLL_MASK = (1 << (POST_ROLL_SAMPLES + 1)) - 1
+
+
+class PreRollBuffer:
+    """
+    Fixed ring buffer holding the last few idle samples.
+
+    Numeric fields live in preallocated float arrays written in place at a
+    wrapping head index, so buffering an idle sample allocates nothing.
+    """
+
+    __slots__ = ("size", "head", "count", "voltage", "force", "variance", "state")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.head = 0
+        self.count = 0
+        self.voltage = array("d", bytes(8 * size))
+        self.force = array("d", bytes(8 * size))
+        self.variance = array("d", bytes(8 * size))
+        self.state = [""] * size
+
+    def append(self, voltage: float, force: float, state: str, variance: float):
+        i = self.head
+        self.voltage[i] = voltage
+        self.force[i] = force
+        self.state[i] = state
+        self.variance[i] = variance
+        self.head = (i + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def drain(self) -> list:
+        """Return buffered samples (oldest first) as tuples and empty the buffer"""
+        start = (self.head - self.count) % self.size
+        readings = []
+        for n in range(self.count):
+            i = (start + n) % self.size
+            readings.append(
+                (self.voltage[i], self.force[i], self.state[i], self.variance[i])
+            )
+        self.count = 0
+        return readings
+
+
 # === GLOBAL STATE ===
 _components = {}
 _running = True
@@ -95,7 +171,12 @@ def initialize_components():
     # 1. Initialize I2C bus and ADC
     logger.info("[1/5] Initializing I2C bus and ADS1115 ADC...")
     try:
-        adc = ADS1115(bus=I2C_BUS, address=ADS1115_ADDRESS)
+        adc = ADS1115(
+            bus=I2C_BUS,
+            address=ADS1115_ADDRESS,
+            rdy_gpio=ADS1115_RDY_GPIO,
+            data_rate=ADS1115_DATA_RATE,
+        )
         if not adc.is_connected():
             logger.warning("ADS1115 not detected! Check I2C connection.")
             logger.info("Continuing in mock mode...")
@@ -111,7 +192,11 @@ def initialize_components():
     try:
         data_mgr = DataManager(db_path=DB_PATH, device_id=DEVICE_ID, user_id=USER_ID)
         components["data_manager"] = data_mgr
-        logger.info(f"✓ DataManager initialized: {DB_PATH}")
+        logger.info(
+            f"✓ DataManager initialized: {DB_PATH} (journal_mode={data_mgr.journal_mode})"
+        )
+        if data_mgr.journal_mode != "wal":
+            logger.warning("WAL not active; inserts will fsync more and block readers")
     except Exception as e:
         logger.error(f"Failed to initialize data manager: {e}")
         raise
@@ -163,7 +248,12 @@ def initialize_components():
 
     # 6. Initialize placeholder components (for team integration)
     logger.info("[6/5] Checking team modules...")
-    if MPU6050_AVAILABLE:
+    try:
+        from firmware.sensors.mpu6050 import MPU6050  # Accelerometer team
+    except ImportError:
+        MPU6050 = None
+
+    if MPU6050 is not None:
         try:
             accelerometer = MPU6050()
             components["accelerometer"] = accelerometer
@@ -175,17 +265,23 @@ def initialize_components():
 
     # Initialize Supabase Client
     logger.info("[6/5] Initializing Supabase client...")
-    try:
-        supabase = SupabaseClient(SUPABASE_URL, SUPABASE_KEY)
-        components["supabase"] = supabase
-        if supabase.is_configured():
-            logger.info("✓ Supabase client configured")
-        else:
-            logger.warning(
-                "! Supabase client has placeholder credentials. Update SUPABASE_URL/KEY."
-            )
-    except Exception as e:
-        logger.error(f"Failed to initialize Supabase client: {e}")
+    if not CLOUD_ENABLED:
+        logger.info("○ Supabase sync disabled (SLEEPSENSE_ENABLE_CLOUD=0)")
+    else:
+        try:
+            from firmware.communication.supabase_client import SupabaseClient
+
+            supabase = SupabaseClient(SUPABASE_URL, SUPABASE_KEY)
+            components["supabase"] = supabase
+            if supabase.is_configured():
+                logger.info("✓ Supabase client configured")
+            else:
+                logger.warning(
+                    "! Supabase client has placeholder credentials. "
+                    "Update SUPABASE_URL/KEY."
+                )
+        except Exception as e:
+            logger.error(f"Failed to initialize Supabase client: {e}")
 
     # Print stats
     stats = data_mgr.get_stats()
@@ -206,6 +302,10 @@ def sync_unsynced_data(components):
     Sync unsynced data to remote server (Supabase).
     Called periodically to handle offline functionality (spec #23).
 
+    Pipelined: while one batch is being uploaded, the DataManager worker
+    is already reading the next page, so a pass takes roughly
+    max(DB time, network time) rather than their sum.
+
     Args:
         components: Dictionary with data_manager and supabase client
     """
@@ -215,33 +315,47 @@ def sync_unsynced_data(components):
     if not data_mgr or not supabase:
         return
 
-    # Get unsynced readings
-    # Increased limit to 100 for better batch efficiency
-    unsynced = data_mgr.get_unsynced_readings(limit=100)
-
-    if not unsynced:
-        return
+    pages: "queue.Queue[list]" = queue.Queue()
 
-    logger.info(f"Found {len(unsynced)} unsynced readings")
+    def fetch(after_id):
+        # Runs on the DataManager worker, alongside the batched inserts
+        if not data_mgr.submit(
+            lambda: pages.put(
+                data_mgr.get_unsynced_readings(
+                    limit=SYNC_BATCH_SIZE, after_id=after_id
+                )
+            )
+        ):
+            # Worker backed up: end this pass, the next one picks up here
+            pages.put([])
 
+    synced = 0
     try:
-        # Convert sqlite3.Row objects to standard list of dicts for JSON serialization
-        # and batch insert via SupabaseClient
-        readings_list = [dict(row) for row in unsynced]
-        
-        # Use insert_batch for network optimization
-        if supabase.insert_batch(readings_list):
-            # If batch upload succeeds, mark all as synced locally
-            ids = [r["id"] for r in readings_list]
-            if data_mgr.mark_synced(ids):
-                logger.info(f"Successfully synced {len(ids)} readings in batch")
-            else:
-                logger.error("Batch upload succeeded but failed to mark local records as synced")
-        else:
-            logger.warning("Batch sync failed (server returned error)")
-
+        fetch(0)
+        for _ in range(SYNC_MAX_BATCHES):
+            batch = pages.get(timeout=SYNC_FETCH_TIMEOUT)
+            if not batch:
+                break
+
+            # Prefetch the next page while this one is on the wire
+            max_id = batch[-1]["id"]
+            fetch(max_id)
+
+            # One bulk POST for the whole batch, then one range DELETE to mark
+            # it synced (the batch is the lowest unsynced IDs up to max_id)
+            if not supabase.insert_readings(batch):
+                logger.warning("Batch sync failed (server returned error)")
+                break
+            data_mgr.submit(lambda max_id=max_id: data_mgr.mark_synced_through(max_id))
+            synced += len(batch)
+
+    except queue.Empty:
+        logger.error("Timed out waiting for unsynced readings")
     except Exception as e:
-        logger.error(f"Error during batch sync: {e}")
+        logger.error("Error during batch sync: %s", e)
+
+    if synced:
+        logger.info("Successfully synced %d readings", synced)
 
 
 def main_loop(components):
@@ -250,111 +364,148 @@ def main_loop(components):
 
     Runs at 10Hz, collecting sensor data, detecting sleep states,
     and storing to SQLite using Variance-Based Event Logging.
+
+    Samples are acquired in bursts of BLOCK_SAMPLES every BLOCK_PERIOD,
+    spaced SAMPLE_RATE apart within the burst, so the stream stays an even
+    10Hz. Force, variance and state are computed for the whole burst and
+    the readings it produces are written with a single store_readings()
+    call, each stamped with its own sample time.
     """
     global _running
 
     fsr = components["fsr"]
     detector = components["detector"]
     data_mgr = components["data_manager"]
-    # supabase client is accessed in sync_unsynced_data
+    supabase = components.get("supabase")
+
+    # Calibration is done: leave the ADC converting the FSR channel so
+    # each burst is conversion-register reads only (no config writes)
+    components["adc"].start_continuous(FSR_CHANNEL)
 
-    last_sync = time.time()
+    last_sync = time.monotonic()
     
     # Event Logging State Machine
     # Pre-roll buffer: holds last 0.5s of data (5 samples at 10Hz)
-    buffer = deque(maxlen=5)
+    pre_roll = PreRollBuffer(PRE_ROLL_SAMPLES)
     is_recording = False
-    post_roll_counter = 0
-    POST_ROLL_SAMPLES = 5  # 0.5s post-roll
+    activity = 0
+
+    samples = 0
 
     # Print header
     print(f"\n{'VOLTAGE':>10} | {'FORCE%':>8} | {'STATE':<18} | {'VAR':>6} | {'REC'}")
     print("-" * 70)
 
+    # Hot-loop lookups bound once (the detector's threshold is fixed after
+    # calibration, which happens before the loop starts)
+    movement_threshold = detector.movement_threshold
+    read_block = fsr.read_block
+    process_block = fsr.process_block
+    update_batch = detector.update_batch
+    store_readings = data_mgr.store_readings
+    monotonic = time.monotonic
+
+    # Absolute deadlines keep a true 2Hz block cadence: the burst paces its
+    # own samples, and the sleep below covers the gap up to the next burst
+    # so work done in the loop body doesn't stretch the sampling period
+    deadline = monotonic()
+
     while _running:
         try:
-            # 1. Read sensor data
-            voltage = fsr.get_voltage()
-            force_pct = fsr.get_force_percentage()
-            variance = fsr.get_variance()
-
-            # 2. Update sleep state
-            state = detector.update(voltage, variance)
-            state_val = state.value
-            
-            # 3. Variance-Based Event Logging Logic
-            # Store data in a tuple for buffering
-            current_reading = (voltage, force_pct, state_val, variance)
-            
-            # Threshold from detector config
-            movement_threshold = detector.movement_threshold
-            
-            should_store = False
-            
-            if variance > movement_threshold:
-                # Movement detected!
-                if not is_recording:
-                    # Start of event: Flush pre-roll buffer first
-                    logger.info("Movement detected - Starting Recording")
-                    for buffered_reading in buffer:
-                        data_mgr.store_reading(*buffered_reading)
-                    is_recording = True
-                
-                # While moving, keep recording and reset post-roll
-                should_store = True
-                post_roll_counter = POST_ROLL_SAMPLES
-                
-            else:
-                # No movement
+            # 1. Read a burst of sensor data (one ADC transaction); the
+            # last sample was taken just now
+            voltages = read_block(BLOCK_SAMPLES, SAMPLE_RATE)
+            block_us = time.time_ns() // 1000
+            forces, variances = process_block(voltages)
+
+            # 2. Update sleep state for the whole burst
+            states = update_batch(voltages, variances, SAMPLE_RATE)
+
+            # 3. Variance-Based Event Logging Logic, per sample
+            rows = []
+            tail = 0  # Samples in this burst after the last stored row
+            for voltage, force_pct, variance, state in zip(
+                voltages, forces, variances, states
+            ):
+                state_val = state.value
+
+                activity = (
+                    (activity << 1) | (variance > movement_threshold)
+                ) & ACTIVITY_MASK
+                was_recording = is_recording
+                is_recording = (activity & POST_ROLL_MASK) != 0
+
                 if is_recording:
-                    # currently in post-roll phase
-                    should_store = True
-                    post_roll_counter -= 1
-                    if post_roll_counter <= 0:
-                        is_recording = False
-                        logger.info("Movement stopped - Ending Recording")
+                    if not was_recording:
+                        # Start of event: pre-roll goes out ahead of this sample
+                        logger.info("Movement detected - Starting Recording")
+                        rows.extend(pre_roll.drain())
+                    rows.append((voltage, force_pct, state_val, variance))
+                    tail = 0
                 else:
+                    if was_recording:
+                        logger.info("Movement stopped - Ending Recording")
                     # Idle: just buffer
-                    buffer.append(current_reading)
-            
-            # Store if we are recording
-            if should_store:
-                data_mgr.store_reading(*current_reading)
-
-            # 4. Display status
-            rec_status = "REC" if is_recording else "..."
-            
-            print(
-                f"{voltage:>10.3f}V | {force_pct:>7.1f}% | {state_val:<18} | "
-                f"{variance:>6.3f} | {rec_status}"
-            )
+                    pre_roll.append(voltage, force_pct, state_val, variance)
+                    tail += 1
+
+            if rows:
+                # Rows are consecutive samples; the newest was taken `tail`
+                # samples before the end of the burst
+                store_readings(
+                    rows, SAMPLE_PERIOD_US, block_us - tail * SAMPLE_PERIOD_US
+                )
+
+            # 4. Display status (throttled: a line per tick costs more than the read)
+            samples += BLOCK_SAMPLES
+            if samples % STATUS_EVERY == 0:
+                rec_status = "REC" if is_recording else "..."
+                print(
+                    f"{voltage:>10.3f}V | {force_pct:>7.1f}% | {state_val:<18} | "
+                    f"{variance:>6.3f} | {rec_status}"
+                )
 
             # 5. Periodic sync check (spec #23 - offline with sync)
-            now = time.time()
-            if now - last_sync > SYNC_INTERVAL:
-                sync_unsynced_data(components)
+            # Runs on the Supabase uploader thread so HTTP never stalls
+            # sampling or the DataManager's batched writes; skipped while the
+            # previous pass is still queued or uploading
+            now = monotonic()
+            if supabase and now - last_sync > SYNC_INTERVAL:
+                supabase.submit(lambda: sync_unsynced_data(components), key="sync")
                 last_sync = now
 
-            # 7. Sleep until next sample
-            time.sleep(SAMPLE_RATE)
+            # 7. Sleep until next sample deadline
+            deadline += BLOCK_PERIOD
+            delay = deadline - monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Overran the period: resync rather than burst to catch up
+                logger.warning("Sample overrun by %.3fs", -delay)
+                deadline = monotonic()
 
         except KeyboardInterrupt:
             logger.info("Keyboard interrupt received")
             break
         except Exception as e:
-            logger.error(f"Error in main loop: {e}")
+            logger.error("Error in main loop: %s", e)
             time.sleep(1)  # Brief pause before retry
+            deadline = time.monotonic()
 
 
 def shutdown(components):
     """Graceful shutdown and cleanup"""
     logger.info("\nShutting down...")
 
-    # Try to sync any remaining data
-    try:
-        sync_unsynced_data(components)
-    except Exception as e:
-        logger.error(f"Error during final sync: {e}")
+    # Final sync is queued behind any in-flight upload; close() drains the
+    # uploader, then closes the persistent HTTPS connection
+    if "supabase" in components:
+        supabase = components["supabase"]
+        supabase.submit(lambda: sync_unsynced_data(components))
+        try:
+            supabase.close()
+        except Exception as e:
+            logger.error(f"Error during final sync: {e}")
 
     # Close hardware connections
     if "adc" in components:
@@ -372,6 +523,12 @@ def shutdown(components):
         except:
             pass
 
+        # Flush buffered readings and close the database
+        try:
+            components["data_manager"].close()
+        except Exception as e:
+            logger.error(f"Error closing data manager: {e}")
+
     logger.info("Shutdown complete. Goodbye!")
 
 
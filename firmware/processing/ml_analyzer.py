@@ -6,23 +6,25 @@ Analyzes historical sleep data using machine learning techniques:
 - Linear regression for trend analysis
 - Rule-based suggestion engine
 
-Dependencies: pandas, scikit-learn, numpy
+Dependencies: numpy, pandas (imported on first aggregation)
 """
 
+import io
 import logging
+import sys
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from enum import Enum
 
 import numpy as np
-import pandas as pd
-from sklearn.cluster import KMeans
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import StandardScaler
 
 logger = logging.getLogger(__name__)
 
+# Result dataclasses use __slots__ where dataclasses supports it (3.10+):
+# no per-instance __dict__, one NightlySummary per night
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
 class SleepQuality(Enum):
     """Sleep quality categories from clustering"""
@@ -32,7 +34,7 @@ class SleepQuality(Enum):
     RESTLESS = "restless"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class NightlySummary:
     """Aggregated sleep metrics for a single night"""
     date: str
@@ -45,7 +47,71 @@ class NightlySummary:
     efficiency: float = 0.0  # Sleep time / total duration
 
 
+# Quality stored as int8 codes in NightlyTable; the code doubles as the
+# 1-4 score used for trend analysis (0 = not yet assigned)
+_QUALITY_BY_CODE = (None, SleepQuality.POOR, SleepQuality.RESTLESS,
+                    SleepQuality.GOOD, SleepQuality.EXCELLENT)
+_CODE_BY_QUALITY = {q: code for code, q in enumerate(_QUALITY_BY_CODE) if q}
+
+# Column of each timed state in the per-night state tally; anything else
+# (e.g. "Empty Bed") is counted in the last, unused column
+_STATE_COLUMN = {'Asleep': 0, 'Present (Awake)': 1, 'Tossing/Turning': 2}
+_OTHER_STATE = 3
+
+# Centroid quality score weights for (sleep, restlessness, efficiency):
+# longer, more efficient sleep scores higher, restlessness lower
+_CENTROID_WEIGHTS = np.array([0.4, -0.02, 0.4])
+
+# Report rules
+_SEP60 = "=" * 60
+_DASH60 = "-" * 60
+
+# Nights the reusable clustering feature buffer holds before it is regrown
+MAX_NIGHTS = 128
+
+
 @dataclass
+class NightlyTable:
+    """
+    Nightly metrics as parallel column arrays (one entry per night).
+    
+    The analysis works on whole columns (feature matrix, means, masks)
+    instead of walking a list of NightlySummary objects attribute by
+    attribute; summaries() materializes the public per-night view.
+    """
+    dates: np.ndarray  # datetime64[D], the night's start date
+    total: np.ndarray
+    sleep: np.ndarray
+    awake: np.ndarray
+    movement_events: np.ndarray
+    rest: np.ndarray
+    eff: np.ndarray
+    quality: np.ndarray  # int8 codes, see _QUALITY_BY_CODE
+    
+    def __len__(self) -> int:
+        return len(self.dates)
+    
+    def summaries(self) -> List[NightlySummary]:
+        """Per-night NightlySummary objects for the public API"""
+        return [
+            NightlySummary(
+                date=str(date),
+                total_duration_hours=float(total),
+                sleep_time_hours=float(sleep),
+                awake_time_hours=float(awake),
+                movement_events=int(events),
+                restlessness_score=float(rest),
+                sleep_quality=_QUALITY_BY_CODE[code],
+                efficiency=float(eff)
+            )
+            for date, total, sleep, awake, events, rest, eff, code in zip(
+                self.dates, self.total, self.sleep, self.awake,
+                self.movement_events, self.rest, self.eff, self.quality
+            )
+        ]
+
+
+@dataclass(**_SLOTS)
 class SleepAnalysis:
     """Complete sleep analysis results"""
     nights: List[NightlySummary]
@@ -58,6 +124,108 @@ class SleepAnalysis:
     insights: Dict[str, Any] = field(default_factory=dict)
 
 
+def _kmeans_small(X: np.ndarray, k: int, seed: int = 42, n_iter: int = 50,
+                  restarts: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lloyd's K-Means for a handful of low-dimensional points.
+    
+    At this size (tens of nights x 3 features) a plain NumPy loop beats
+    sklearn's KMeans, whose input validation and threadpool setup
+    dominate the actual distance math.
+    
+    Args:
+        X: (n, d) float array of points
+        k: Number of clusters (k <= n)
+        seed: Random seed (k-means++ seeding)
+        n_iter: Maximum Lloyd iterations per restart
+        restarts: Number of seedings; the lowest-inertia run wins
+        
+    Returns:
+        Tuple of (labels (n,), centroids (k, d))
+    """
+    rng = np.random.default_rng(seed)
+    n = len(X)
+    x2 = np.einsum('ni,ni->n', X, X)
+    n_trials = 2 + int(np.log(k))
+    
+    best_inertia = np.inf
+    best = None
+    for _ in range(restarts):
+        # Greedy k-means++ seeding: draw a few candidates with probability
+        # ~ D^2 and keep the one that lowers the total D^2 the most
+        C = np.empty((k, X.shape[1]), dtype=X.dtype)
+        C[0] = X[rng.integers(n)]
+        d2 = ((X - C[0]) ** 2).sum(axis=1)
+        for j in range(1, k):
+            total = d2.sum()
+            if total > 0:
+                cand = rng.choice(n, size=n_trials, p=d2 / total)
+            else:
+                cand = rng.integers(n, size=n_trials)
+            cand_d2 = np.minimum(d2, ((X[None, :, :] - X[cand, None, :]) ** 2).sum(axis=2))
+            best_cand = cand_d2.sum(axis=1).argmin()
+            C[j] = X[cand[best_cand]]
+            d2 = cand_d2[best_cand]
+        
+        labels = None
+        for _ in range(n_iter):
+            # Squared distances via |x|^2 + |c|^2 - 2 x.c
+            D2 = x2[:, None] + np.einsum('ki,ki->k', C, C)[None, :] - 2 * X @ C.T
+            new_labels = D2.argmin(axis=1)
+            if labels is not None and np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+            
+            # Centroid update; an empty cluster keeps its previous centroid
+            sums = np.zeros_like(C)
+            np.add.at(sums, labels, X)
+            counts = np.bincount(labels, minlength=k)
+            filled = counts > 0
+            C[filled] = sums[filled] / counts[filled, None]
+        
+        inertia = ((X - C[labels]) ** 2).sum()
+        if inertia < best_inertia:
+            best_inertia = inertia
+            best = (labels, C)
+    
+    return best
+
+
+def _group_quantile(values: np.ndarray, codes: np.ndarray, n_groups: int,
+                    q: float) -> np.ndarray:
+    """
+    q-quantile of each group, skipping NaN (pandas' linear interpolation).
+    
+    One lexsort orders every group's values at once; each quantile is
+    then read at its offset inside the group instead of sorting every
+    group separately.
+    
+    Args:
+        values: (n,) float array
+        codes: (n,) group index of each value, 0 <= code < n_groups
+        n_groups: Number of groups (each must have at least one value)
+        q: Quantile in [0, 1]
+        
+    Returns:
+        (n_groups,) array of quantiles (NaN for all-NaN groups)
+    """
+    # NaN sorts to the end of its group, past the valid values
+    sorted_values = values[np.lexsort((values, codes))]
+    sizes = np.bincount(codes, minlength=n_groups)
+    starts = np.cumsum(sizes) - sizes
+    last = np.bincount(codes, weights=~np.isnan(values), minlength=n_groups).astype(np.intp) - 1
+    
+    pos = q * np.maximum(last, 0)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, np.maximum(last, 0))
+    frac = pos - lo
+    
+    lo_values = sorted_values[starts + lo]
+    result = lo_values + (sorted_values[starts + hi] - lo_values) * frac
+    result[last < 0] = np.nan
+    return result
+
+
 class SleepMLAnalyzer:
     """
     Machine Learning Sleep Pattern Analyzer
@@ -68,9 +236,11 @@ class SleepMLAnalyzer:
     """
     
     def __init__(self):
-        self.scaler = StandardScaler()
-        self.clusterer = None
-        self.trend_model = None
+        self.cluster_centers = None
+        # Clustering features (sleep, restlessness, efficiency), reused
+        # across analyses; float32 is plenty for scores of this range
+        self._feat_buf = np.empty((MAX_NIGHTS, 3), dtype=np.float32)
+        self.trend_coef = None  # (slope, intercept) of the last trend fit
         
     def analyze(self, readings: List[Dict], n_clusters: int = 3) -> SleepAnalysis:
         """
@@ -89,7 +259,7 @@ class SleepMLAnalyzer:
         
         # Step 1: Aggregate readings into nightly summaries
         nightly_data = self._aggregate_nights(readings)
-        if not nightly_data:
+        if not len(nightly_data):
             return self._empty_analysis()
         
         # Step 2: Feature extraction and clustering
@@ -98,24 +268,27 @@ class SleepMLAnalyzer:
         # Step 3: Trend analysis
         trend = self._analyze_trends(nightly_data)
         
+        # Column statistics shared by the insight and recommendation steps
+        stats = self._night_stats(nightly_data)
+        
         # Step 4: Generate insights
-        insights = self._generate_insights(nightly_data, trend)
+        insights = self._generate_insights(nightly_data, trend, stats)
         
         # Step 5: Build recommendations
-        recommendations = self._generate_recommendations(nightly_data, trend, insights)
+        recommendations = self._generate_recommendations(nightly_data, trend, insights, stats)
         
         return SleepAnalysis(
-            nights=nightly_data,
+            nights=nightly_data.summaries(),
             overall_quality=self._get_overall_quality(nightly_data),
             trend_direction=trend["direction"],
             trend_slope=trend["slope"],
-            average_sleep_duration=np.mean([n.sleep_time_hours for n in nightly_data]),
-            average_restlessness=np.mean([n.restlessness_score for n in nightly_data]),
+            average_sleep_duration=stats["avg_sleep"],
+            average_restlessness=stats["avg_rest"],
             recommendations=recommendations,
             insights=insights
         )
     
-    def _aggregate_nights(self, readings: List[Dict]) -> List[NightlySummary]:
+    def _aggregate_nights(self, readings: List[Dict]) -> NightlyTable:
         """
         Aggregate raw readings into nightly sleep summaries.
         
@@ -125,70 +298,110 @@ class SleepMLAnalyzer:
         - Movement frequency
         - Sleep efficiency
         """
-        df = pd.DataFrame(readings)
-        
-        if df.empty:
-            return []
+        if not readings:
+            return self._empty_table()
+        
+        # pandas is only needed for timestamp parsing; importing it here
+        # keeps it off the startup path of processes that never analyze
+        import pandas as pd
+        
+        # Pull the three columns straight out of the reading dicts; at a
+        # few nights of readings a DataFrame + groupby costs more than
+        # the aggregation itself
+        key = 'created_at' if any('created_at' in r for r in readings) else 'timestamp'
+        stamps = pd.to_datetime([r.get(key) for r in readings])
+        if stamps.tz is not None:
+            stamps = stamps.tz_localize(None)  # nights follow wall-clock time
+        timestamps = stamps.to_numpy()
+        states = np.fromiter(
+            (_STATE_COLUMN.get(r.get('state'), _OTHER_STATE) for r in readings),
+            np.intp, len(readings)
+        )
+        variance = np.array([r.get('variance') for r in readings], dtype=np.float64)
         
-        # Convert timestamp to datetime
-        df['timestamp'] = pd.to_datetime(df.get('created_at', df.get('timestamp')))
+        # Drop readings without a parseable timestamp and sort by time;
+        # sleep nights are monotonic in time, so each night becomes one
+        # contiguous run
+        order = np.argsort(timestamps, kind='stable')
+        order = order[~np.isnat(timestamps[order])]
+        timestamps = timestamps[order]
+        states = states[order]
+        variance = variance[order]
         
         # Group by "sleep night" - from 6 PM to 6 PM next day
         # This handles overnight sleep sessions that span midnight
-        df['sleep_night'] = df['timestamp'].apply(
-            lambda x: (x - pd.Timedelta(hours=18)).date()
+        sleep_night = (timestamps - np.timedelta64(18, 'h')).astype('datetime64[D]')
+        dates, night_codes, count = np.unique(
+            sleep_night, return_inverse=True, return_counts=True
+        )
+        n = len(dates)
+        if not n:
+            return self._empty_table()
+        
+        # Calculate duration (first and last reading of each run)
+        starts = np.cumsum(count) - count
+        total_duration = (
+            (timestamps[starts + count - 1] - timestamps[starts])
+            / np.timedelta64(1, 's') / 3600
         )
         
-        nights = []
-        for date, group in df.groupby('sleep_night'):
-            # Sort by timestamp
-            group = group.sort_values('timestamp')
-            
-            # Calculate duration
-            if len(group) > 1:
-                total_duration = (group['timestamp'].max() - group['timestamp'].min()).total_seconds() / 3600
-            else:
-                total_duration = 0
-            
-            # Count states
-            state_counts = group['state'].value_counts()
-            
-            # Time estimates based on reading frequency
-            # Assume readings are roughly evenly spaced during the night
-            avg_interval_minutes = total_duration * 60 / len(group) if len(group) > 1 else 5
-            
-            # Calculate time in each state (approximate)
-            sleep_time = state_counts.get('Asleep', 0) * avg_interval_minutes / 60
-            awake_time = state_counts.get('Present (Awake)', 0) * avg_interval_minutes / 60
-            moving_time = state_counts.get('Tossing/Turning', 0) * avg_interval_minutes / 60
-            
-            # Movement events (significant variance changes)
-            movement_events = len(group[group['variance'] > group['variance'].quantile(0.8)])
-            
-            # Restlessness score (0-100, higher = more restless)
-            total_time = sleep_time + awake_time + moving_time
-            if total_time > 0:
-                restlessness = (moving_time / total_time) * 100 + (movement_events / len(group)) * 20
-                restlessness = min(restlessness, 100)  # Cap at 100
-            else:
-                restlessness = 0
+        # Count states (one tally row per night, columns per _STATE_COLUMN)
+        state_counts = np.bincount(
+            night_codes * (_OTHER_STATE + 1) + states,
+            minlength=n * (_OTHER_STATE + 1)
+        ).reshape(n, _OTHER_STATE + 1)
+        
+        # Time estimates based on reading frequency
+        # Assume readings are roughly evenly spaced during the night
+        avg_interval_minutes = np.where(count > 1, total_duration * 60 / count, 5)
+        
+        # Calculate time in each state (approximate)
+        sleep_time = state_counts[:, 0] * avg_interval_minutes / 60
+        awake_time = state_counts[:, 1] * avg_interval_minutes / 60
+        moving_time = state_counts[:, 2] * avg_interval_minutes / 60
+        
+        # Movement events (readings above their night's 80th variance percentile)
+        q80 = _group_quantile(variance, night_codes, n, 0.8)
+        movement_events = np.bincount(
+            night_codes, weights=variance > q80[night_codes], minlength=n
+        ).astype(np.int64)
+        
+        # Restlessness score (0-100, higher = more restless)
+        total_time = sleep_time + awake_time + moving_time
+        has_time = total_time > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            restlessness = np.where(
+                has_time,
+                np.minimum((moving_time / total_time) * 100 + (movement_events / count) * 20, 100),
+                0
+            )  # Cap at 100
             
             # Efficiency: sleep time / total time in bed
-            efficiency = (sleep_time / total_time * 100) if total_time > 0 else 0
-            
-            nights.append(NightlySummary(
-                date=str(date),
-                total_duration_hours=total_time,
-                sleep_time_hours=sleep_time,
-                awake_time_hours=awake_time + moving_time,
-                movement_events=movement_events,
-                restlessness_score=round(restlessness, 1),
-                efficiency=round(efficiency, 1)
-            ))
-        
-        return sorted(nights, key=lambda x: x.date)
+            efficiency = np.where(has_time, sleep_time / total_time * 100, 0)
+        
+        # round() on Python floats, as the report has always shown them
+        return NightlyTable(
+            dates=dates,
+            total=total_time,
+            sleep=sleep_time,
+            awake=awake_time + moving_time,
+            movement_events=movement_events,
+            rest=np.fromiter((round(x, 1) for x in restlessness.tolist()), np.float64, n),
+            eff=np.fromiter((round(x, 1) for x in efficiency.tolist()), np.float64, n),
+            quality=np.zeros(n, dtype=np.int8)
+        )
+    
+    @staticmethod
+    def _empty_table() -> NightlyTable:
+        """NightlyTable with no nights"""
+        empty = np.empty(0, dtype=np.float64)
+        return NightlyTable(
+            dates=np.empty(0, dtype='datetime64[D]'), total=empty, sleep=empty, awake=empty,
+            movement_events=np.empty(0, dtype=np.int64), rest=empty, eff=empty,
+            quality=np.empty(0, dtype=np.int8)
+        )
     
-    def _cluster_nights(self, nights: List[NightlySummary], n_clusters: int = 3):
+    def _cluster_nights(self, nights: NightlyTable, n_clusters: int = 3):
         """
         Apply K-Means clustering to categorize nights by quality.
         
@@ -199,60 +412,64 @@ class SleepMLAnalyzer:
         """
         if len(nights) < n_clusters:
             # Not enough data, assign all as "good"
-            for night in nights:
-                night.sleep_quality = SleepQuality.GOOD
+            nights.quality[:] = _CODE_BY_QUALITY[SleepQuality.GOOD]
             return
         
-        # Extract features
-        features = np.array([
-            [n.sleep_time_hours, n.restlessness_score, n.efficiency]
-            for n in nights
-        ])
-        
-        # Scale features
-        scaled_features = self.scaler.fit_transform(features)
+        # Extract features into the preallocated float32 buffer
+        n = len(nights)
+        if n > len(self._feat_buf):
+            self._feat_buf = np.empty((n, 3), dtype=np.float32)
+        features = self._feat_buf[:n]
+        features[:, 0] = nights.sleep
+        features[:, 1] = nights.rest
+        features[:, 2] = nights.eff
+        
+        # Scale features to zero mean / unit variance in place (constant
+        # columns keep scale 1); for a few dozen rows a scaler object's
+        # validation and copies cost more than the arithmetic
+        mu = features.mean(axis=0)
+        sigma = features.std(axis=0)
+        sigma[sigma < 1e-6] = 1.0
+        scaled_features = np.subtract(features, mu, out=features)
+        np.divide(scaled_features, sigma, out=scaled_features)
         
         # Cluster
-        self.clusterer = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-        labels = self.clusterer.fit_predict(scaled_features)
+        labels, centroids = _kmeans_small(scaled_features, n_clusters)
+        self.cluster_centers = centroids
         
         # Map clusters to quality levels based on feature centroids
-        centroids = self.clusterer.cluster_centers_
         
         # Calculate quality score for each centroid (higher sleep, lower restlessness = better)
         # Unscale to original feature space for interpretation
-        centroids_unscaled = self.scaler.inverse_transform(centroids)
-        quality_scores = []
-        
-        for centroid in centroids_unscaled:
-            sleep_time, restlessness, efficiency = centroid
-            # Simple scoring: weight sleep duration and efficiency positively, restlessness negatively
-            score = (sleep_time * 0.4) + (efficiency * 0.4) - (restlessness * 0.02)
-            quality_scores.append(score)
-        
-        # Sort clusters by quality score
-        sorted_indices = np.argsort(quality_scores)
-        
-        # Map to quality enum
-        cluster_to_quality = {}
-        n_clusters_actual = len(sorted_indices)
-        
-        if n_clusters_actual >= 3:
-            cluster_to_quality[sorted_indices[0]] = SleepQuality.POOR
-            cluster_to_quality[sorted_indices[-1]] = SleepQuality.EXCELLENT
-            for i in sorted_indices[1:-1]:
-                cluster_to_quality[i] = SleepQuality.GOOD
-        elif n_clusters_actual == 2:
-            cluster_to_quality[sorted_indices[0]] = SleepQuality.POOR
-            cluster_to_quality[sorted_indices[1]] = SleepQuality.GOOD
+        centroids_unscaled = centroids * sigma + mu
+        quality_scores = centroids_unscaled @ _CENTROID_WEIGHTS
+        
+        # Map clusters to quality codes (lookup array indexed by cluster label)
+        poor = _CODE_BY_QUALITY[SleepQuality.POOR]
+        good = _CODE_BY_QUALITY[SleepQuality.GOOD]
+        excellent = _CODE_BY_QUALITY[SleepQuality.EXCELLENT]
+        cluster_to_quality = np.full(n_clusters, good, dtype=np.int8)
+        
+        if n_clusters == 3:
+            # Default case: only the worst and best centroid need finding,
+            # no sort (ties resolve as a stable sort would: first lowest,
+            # last highest)
+            cluster_to_quality[quality_scores.argmin()] = poor
+            cluster_to_quality[2 - quality_scores[::-1].argmax()] = excellent
         else:
-            cluster_to_quality[sorted_indices[0]] = SleepQuality.GOOD
+            # Sort clusters by quality score
+            sorted_indices = np.argsort(quality_scores, kind='stable')
+            
+            if n_clusters > 3:
+                cluster_to_quality[sorted_indices[0]] = poor
+                cluster_to_quality[sorted_indices[-1]] = excellent
+            elif n_clusters == 2:
+                cluster_to_quality[sorted_indices[0]] = poor
         
         # Assign qualities to nights
-        for night, label in zip(nights, labels):
-            night.sleep_quality = cluster_to_quality.get(label, SleepQuality.GOOD)
+        nights.quality[:] = cluster_to_quality[labels]
     
-    def _analyze_trends(self, nights: List[NightlySummary]) -> Dict:
+    def _analyze_trends(self, nights: NightlyTable) -> Dict:
         """
         Analyze sleep quality trends over time using linear regression.
         
@@ -262,26 +479,26 @@ class SleepMLAnalyzer:
         if len(nights) < 3:
             return {"direction": "stable", "slope": 0.0}
         
-        # Create quality score for each night (1-4 scale)
-        quality_scores = []
-        for night in nights:
-            if night.sleep_quality == SleepQuality.EXCELLENT:
-                quality_scores.append(4)
-            elif night.sleep_quality == SleepQuality.GOOD:
-                quality_scores.append(3)
-            elif night.sleep_quality == SleepQuality.RESTLESS:
-                quality_scores.append(2)
-            else:
-                quality_scores.append(1)
-        
-        # Linear regression on day index vs quality score
-        X = np.arange(len(nights)).reshape(-1, 1)
-        y = np.array(quality_scores)
-        
-        self.trend_model = LinearRegression()
-        self.trend_model.fit(X, y)
-        
-        slope = self.trend_model.coef_[0]
+        # Quality score for each night (1-4 scale) is the quality code;
+        # unassigned nights count as poor
+        y = np.maximum(nights.quality, 1).astype(np.float64)
+        
+        # Linear regression on day index vs quality score (closed-form
+        # least squares; a handful of points doesn't need an estimator)
+        x = np.arange(len(y), dtype=np.float64)
+        dx = x - x.mean()
+        dy = y - y.mean()
+        slope = (dx @ dy) / (dx @ dx)
+        intercept = y.mean() - slope * x.mean()
+        self.trend_coef = (float(slope), float(intercept))
+        
+        # R^2 (a constant series is a perfect fit for a flat line)
+        ss_res = ((dy - slope * dx) ** 2).sum()
+        ss_tot = (dy ** 2).sum()
+        if ss_tot > 0:
+            r_squared = 1 - ss_res / ss_tot
+        else:
+            r_squared = 1.0 if ss_res == 0 else 0.0
         
         # Interpret trend
         if slope > 0.1:
@@ -294,54 +511,77 @@ class SleepMLAnalyzer:
         return {
             "direction": direction,
             "slope": float(slope),
-            "r_squared": self.trend_model.score(X, y)
+            "r_squared": float(r_squared)
         }
     
-    def _generate_insights(self, nights: List[NightlySummary], trend: Dict) -> Dict:
+    @staticmethod
+    def _night_stats(nights: NightlyTable) -> Dict:
+        """
+        Means and spread of the nightly columns, computed once per analysis.
+        
+        Args:
+            nights: Non-empty nightly table
+            
+        Returns:
+            Dict with avg_sleep, avg_rest, avg_eff and std_sleep
+        """
+        avg_sleep = nights.sleep.mean()
+        return {
+            "avg_sleep": avg_sleep,
+            "avg_rest": nights.rest.mean(),
+            "avg_eff": nights.eff.mean(),
+            # Same as np.std, reusing the mean above
+            "std_sleep": np.sqrt(np.mean((nights.sleep - avg_sleep) ** 2)),
+        }
+    
+    def _generate_insights(self, nights: NightlyTable, trend: Dict,
+                           stats: Dict) -> Dict:
         """Generate data-driven insights"""
         insights = {}
         
-        if not nights:
+        if not len(nights):
             return insights
         
-        # Best and worst nights
-        sorted_by_quality = sorted(nights, key=lambda x: 
-            (x.sleep_time_hours, -x.restlessness_score), reverse=True)
+        # Best and worst nights: most sleep first, then least restless
+        # (ties keep night order). Only the two ends of that ranking are
+        # needed, so pick them with masks instead of sorting
+        sleep, rest = nights.sleep, nights.rest
+        most = sleep == sleep.max()
+        best = np.flatnonzero(most & (rest == rest[most].min()))[0]
+        least = sleep == sleep.min()
+        worst = np.flatnonzero(least & (rest == rest[least].max()))[-1]
         
-        insights["best_night"] = sorted_by_quality[0].date if sorted_by_quality else None
-        insights["worst_night"] = sorted_by_quality[-1].date if len(sorted_by_quality) > 1 else None
+        insights["best_night"] = str(nights.dates[best])
+        insights["worst_night"] = str(nights.dates[worst]) if len(nights) > 1 else None
         
         # Consistency metrics
-        sleep_durations = [n.sleep_time_hours for n in nights]
-        insights["consistency_score"] = 100 - np.std(sleep_durations) * 10  # Higher = more consistent
+        insights["consistency_score"] = 100 - stats["std_sleep"] * 10  # Higher = more consistent
         insights["consistency_score"] = max(0, min(100, insights["consistency_score"]))
         
-        # Weekday vs weekend patterns
-        df = pd.DataFrame([{"date": n.date, "sleep_time": n.sleep_time_hours, 
-                           "quality": n.sleep_quality.value} for n in nights])
-        df['date'] = pd.to_datetime(df['date'])
-        df['is_weekend'] = df['date'].dt.dayofweek >= 5
+        # Weekday vs weekend patterns (day 0 of the epoch was a Thursday,
+        # so +3 makes Monday 0)
+        day_of_week = (nights.dates.astype(np.int64) + 3) % 7
+        is_weekend = day_of_week >= 5
         
-        weekend_avg = df[df['is_weekend']]['sleep_time'].mean() if df['is_weekend'].any() else 0
-        weekday_avg = df[~df['is_weekend']]['sleep_time'].mean() if (~df['is_weekend']).any() else 0
+        weekend_avg = nights.sleep[is_weekend].mean() if is_weekend.any() else 0
+        weekday_avg = nights.sleep[~is_weekend].mean() if (~is_weekend).any() else 0
         
         insights["weekend_weekday_diff"] = weekend_avg - weekday_avg
         insights["sleeps_more_on_weekends"] = weekend_avg > weekday_avg + 0.5
         
         # Restlessness patterns
-        restlessness_by_day = [(n.date, n.restlessness_score) for n in nights]
-        high_restless_days = [d for d, r in restlessness_by_day if r > 50]
-        insights["high_restlessness_days"] = high_restless_days
-        insights["average_restlessness"] = np.mean([n.restlessness_score for n in nights])
+        insights["high_restlessness_days"] = nights.dates[nights.rest > 50].astype(str).tolist()
+        insights["average_restlessness"] = stats["avg_rest"]
         
         return insights
     
-    def _generate_recommendations(self, nights: List[NightlySummary], 
-                                 trend: Dict, insights: Dict) -> List[str]:
+    def _generate_recommendations(self, nights: NightlyTable, 
+                                 trend: Dict, insights: Dict,
+                                 stats: Dict) -> List[str]:
         """Generate actionable sleep recommendations"""
         recommendations = []
         
-        if not nights:
+        if not len(nights):
             return ["Insufficient data for recommendations. Collect at least 3-4 nights of data."]
         
         # Trend-based recommendations
@@ -375,7 +615,7 @@ class SleepMLAnalyzer:
             )
         
         # Duration recommendations
-        avg_sleep = np.mean([n.sleep_time_hours for n in nights])
+        avg_sleep = stats["avg_sleep"]
         if avg_sleep < 6:
             recommendations.append(
                 f"Your average sleep time ({avg_sleep:.1f} hours) is below the recommended 7-9 hours. "
@@ -388,7 +628,7 @@ class SleepMLAnalyzer:
             )
         
         # Efficiency recommendations
-        avg_efficiency = np.mean([n.efficiency for n in nights])
+        avg_efficiency = stats["avg_eff"]
         if avg_efficiency < 80:
             recommendations.append(
                 f"Your sleep efficiency is {avg_efficiency:.0f}% (time asleep vs time in bed). "
@@ -403,17 +643,15 @@ class SleepMLAnalyzer:
         
         return recommendations
     
-    def _get_overall_quality(self, nights: List[NightlySummary]) -> SleepQuality:
+    def _get_overall_quality(self, nights: NightlyTable) -> SleepQuality:
         """Calculate overall quality based on majority cluster"""
-        if not nights:
+        if not len(nights):
             return SleepQuality.GOOD
         
-        qualities = [n.sleep_quality for n in nights]
-        quality_counts = {}
-        for q in qualities:
-            quality_counts[q] = quality_counts.get(q, 0) + 1
-        
-        return max(quality_counts, key=quality_counts.get)
+        # Most common code; ties go to the one seen first
+        counts = np.bincount(nights.quality, minlength=len(_QUALITY_BY_CODE))
+        is_top = counts[nights.quality] == counts.max()
+        return _QUALITY_BY_CODE[nights.quality[np.argmax(is_top)]]
     
     def _empty_analysis(self) -> SleepAnalysis:
         """Return empty analysis for no data"""
@@ -431,71 +669,55 @@ class SleepMLAnalyzer:
 
 def format_analysis_report(analysis: SleepAnalysis) -> str:
     """Format analysis results into a human-readable report"""
-    lines = [
-        "=" * 60,
-        "SLEEP PATTERN ANALYSIS REPORT",
-        "=" * 60,
-        "",
-        f"Analysis Period: {len(analysis.nights)} nights",
-        f"Overall Quality: {analysis.overall_quality.value.upper()}",
-        f"Trend: {analysis.trend_direction.upper()} (slope: {analysis.trend_slope:.2f})",
-        "",
-        "-" * 60,
-        "AVERAGE METRICS",
-        "-" * 60,
-        f"  Average Sleep Duration: {analysis.average_sleep_duration:.1f} hours",
-        f"  Average Restlessness: {analysis.average_restlessness:.1f}/100",
-        "",
-    ]
+    buf = io.StringIO()
+    w = buf.write
+    
+    w(f"""{_SEP60}
+SLEEP PATTERN ANALYSIS REPORT
+{_SEP60}
+
+Analysis Period: {len(analysis.nights)} nights
+Overall Quality: {analysis.overall_quality.value.upper()}
+Trend: {analysis.trend_direction.upper()} (slope: {analysis.trend_slope:.2f})
+
+{_DASH60}
+AVERAGE METRICS
+{_DASH60}
+  Average Sleep Duration: {analysis.average_sleep_duration:.1f} hours
+  Average Restlessness: {analysis.average_restlessness:.1f}/100
+
+""")
     
     if analysis.nights:
-        lines.extend([
-            "-" * 60,
-            "NIGHTLY BREAKDOWN",
-            "-" * 60,
-        ])
+        w(f"{_DASH60}\nNIGHTLY BREAKDOWN\n{_DASH60}\n")
         for night in analysis.nights:
-            lines.append(
-                f"  {night.date}: {night.sleep_time_hours:.1f}h sleep, "
-                f"{night.restlessness_score:.0f}% restless [{night.sleep_quality.value}]"
-            )
-        lines.append("")
+            w(f"  {night.date}: {night.sleep_time_hours:.1f}h sleep, "
+              f"{night.restlessness_score:.0f}% restless [{night.sleep_quality.value}]\n")
+        w("\n")
     
-    lines.extend([
-        "-" * 60,
-        "INSIGHTS",
-        "-" * 60,
-    ])
+    w(f"{_DASH60}\nINSIGHTS\n{_DASH60}\n")
     
     if analysis.insights:
         if "best_night" in analysis.insights:
-            lines.append(f"  Best Night: {analysis.insights['best_night']}")
+            w(f"  Best Night: {analysis.insights['best_night']}\n")
         if "worst_night" in analysis.insights:
-            lines.append(f"  Worst Night: {analysis.insights['worst_night']}")
+            w(f"  Worst Night: {analysis.insights['worst_night']}\n")
         if "consistency_score" in analysis.insights:
-            lines.append(f"  Consistency Score: {analysis.insights['consistency_score']:.0f}/100")
+            w(f"  Consistency Score: {analysis.insights['consistency_score']:.0f}/100\n")
         if analysis.insights.get("sleeps_more_on_weekends"):
             diff = analysis.insights.get("weekend_weekday_diff", 0)
-            lines.append(f"  Weekend Effect: You sleep {diff:.1f}h more on weekends")
+            w(f"  Weekend Effect: You sleep {diff:.1f}h more on weekends\n")
     else:
-        lines.append("  No insights available")
+        w("  No insights available\n")
     
-    lines.extend([
-        "",
-        "-" * 60,
-        "RECOMMENDATIONS",
-        "-" * 60,
-    ])
+    w(f"\n{_DASH60}\nRECOMMENDATIONS\n{_DASH60}\n")
     
     for i, rec in enumerate(analysis.recommendations, 1):
-        lines.append(f"  {i}. {rec}")
+        w(f"  {i}. {rec}\n")
     
-    lines.extend([
-        "",
-        "=" * 60,
-    ])
+    w(f"\n{_SEP60}")
     
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 # Convenience function for testing
@@ -504,66 +726,47 @@ if __name__ == "__main__":
     
     print("Generating synthetic sleep data for testing...")
     
-    # Generate test data
-    test_readings = []
+    # Generate test data: one sleep session per night from 11 PM to 7 AM
+    # (8 hours), a reading every 5 minutes, built as whole arrays
+    rng = np.random.default_rng(0)
+    n_nights, per_night = 7, 96
     base_date = datetime.now() - timedelta(days=7)
+    first_start = np.datetime64(
+        base_date.replace(hour=23, minute=0, second=0, microsecond=0), 's'
+    )
     
-    for day in range(7):
-        # Simulate a sleep session from 11 PM to 7 AM (8 hours)
-        # For testing, we'll keep it on one "logical night" by using the start date
-        night_date = base_date + timedelta(days=day)
-        start_time = night_date.replace(hour=23, minute=0, second=0)
-        end_time = start_time + timedelta(hours=8)
-        
-        # Vary the sleep quality per night to create interesting clusters
-        sleep_quality_factor = 0.3 + (day * 0.1)  # Improving over the week
-        restlessness_base = 0.15 - (day * 0.02)   # Decreasing over the week
-        
-        print(f"Generating night {day+1}/7: {night_date.date()} (quality factor: {sleep_quality_factor:.2f})")
-        
-        # Generate readings every 5 minutes
-        reading_count = 0
-        current = start_time
-        while current < end_time:
-            # Calculate minutes into sleep session (0-480 minutes)
-            minutes_into_sleep = (current - start_time).total_seconds() / 60
-            sleep_progress = minutes_into_sleep / 480  # 0.0 to 1.0
-            
-            # Simulate realistic sleep stages
-            if sleep_progress < 0.1:  # First 10% - falling asleep
-                state = "Present (Awake)"
-                variance = 0.05
-            elif sleep_progress > 0.9:  # Last 10% - waking up
-                state = "Present (Awake)"
-                variance = 0.04
-            elif 0.3 < sleep_progress < 0.7:  # Middle - deep sleep
-                state = "Asleep"
-                variance = 0.015
-            else:  # Light sleep
-                state = "Asleep"
-                variance = 0.025
-            
-            # Add random movements based on restlessness
-            if np.random.random() < restlessness_base:
-                state = "Tossing/Turning"
-                variance = 0.08 + np.random.random() * 0.04
-            
-            # Occasionally wake up briefly
-            if np.random.random() < 0.02:
-                state = "Present (Awake)"
-                variance = 0.06
-            
-            test_readings.append({
-                'created_at': current.isoformat(),
-                'timestamp': current.isoformat(),
-                'state': state,
-                'variance': variance,
-                'voltage': 2.5 if state != "Empty Bed" else 0.3
-            })
-            reading_count += 1
-            current += timedelta(minutes=5)
-        
-        print(f"  Generated {reading_count} readings")
+    day = np.repeat(np.arange(n_nights), per_night)
+    tick = np.tile(np.arange(per_night), n_nights)
+    timestamps = first_start + day * np.timedelta64(1, 'D') + tick * np.timedelta64(5, 'm')
+    sleep_progress = tick * 5 / 480  # 0.0 to 1.0 through the session
+    restlessness_base = 0.15 - day * 0.02  # Decreasing over the week
+    
+    # Simulate realistic sleep stages: awake while falling asleep (first
+    # 10%) and waking up (last 10%), deep sleep in the middle, light
+    # sleep otherwise
+    state_names = np.array(["Present (Awake)", "Asleep", "Tossing/Turning"])
+    falling_asleep = sleep_progress < 0.1
+    waking_up = sleep_progress > 0.9
+    deep_sleep = (0.3 < sleep_progress) & (sleep_progress < 0.7)
+    states = np.where(falling_asleep | waking_up, 0, 1)
+    variance = np.select([falling_asleep, waking_up, deep_sleep], [0.05, 0.04, 0.015], 0.025)
+    
+    # Add random movements based on restlessness
+    moving = rng.random(len(tick)) < restlessness_base
+    states[moving] = 2
+    variance[moving] = 0.08 + rng.random(moving.sum()) * 0.04
+    
+    # Occasionally wake up briefly
+    woke = rng.random(len(tick)) < 0.02
+    states[woke] = 0
+    variance[woke] = 0.06
+    
+    test_readings = [
+        {'created_at': ts, 'timestamp': ts, 'state': state, 'variance': var, 'voltage': 2.5}
+        for ts, state, var in zip(np.datetime_as_string(timestamps).tolist(),
+                                  state_names[states].tolist(), variance.tolist())
+    ]
+    print(f"Generated {per_night} readings per night for {n_nights} nights")
     
     print(f"\nTotal readings: {len(test_readings)}")
     
@@ -6,7 +6,7 @@ Extracted and refactored from main.py to meet specification #8 code structure.
 
 import time
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -51,10 +51,10 @@ class SleepDetector:
         self.movement_threshold = self.config.get('movement_threshold', 0.05)
         self.sleep_delay = self.config.get('sleep_delay', 60)  # seconds
         
-        # State tracking
+        # State tracking (time.monotonic() seconds, immune to clock jumps
+        # from NTP syncs that would otherwise skew sleep_delay)
         self.current_state = SleepState.EMPTY
-        self.last_move_time = time.time()
-        self.state_start_time = time.time()
+        self.last_move_time = self.state_start_time = time.monotonic()
         self.last_voltage = 0.0
         self.last_variance = 0.0
         
@@ -74,11 +74,37 @@ class SleepDetector:
         Returns:
             Current sleep state
         """
+        return self._step(voltage, variance, time.monotonic())
+    
+    def update_batch(self, voltages: List[float], variances: List[float],
+                     period: float = 0.0) -> List[SleepState]:
+        """
+        Update sleep state for a burst of readings that has just ended.
+        
+        The last reading is timed now and each earlier one period before
+        the next, so stillness and movement durations match the real
+        sample times.
+        
+        Args:
+            voltages: Voltage readings, oldest first
+            variances: Variance for each reading
+            period: Seconds between readings (0 = all taken together)
+            
+        Returns:
+            Sleep state after each reading
+        """
+        step = self._step
+        start = time.monotonic() - (len(voltages) - 1) * period
+        return [
+            step(v, var, start + i * period)
+            for i, (v, var) in enumerate(zip(voltages, variances))
+        ]
+    
+    def _step(self, voltage: float, variance: float, now: float) -> SleepState:
+        """Advance the state machine by one reading taken at time now"""
         self.last_voltage = voltage
         self.last_variance = variance
         
-        now = time.time()
-        
         # Logic tree (from original main.py)
         if voltage < self.empty_threshold:
             # Bed is empty (voltage too low for occupied state)
@@ -104,8 +130,8 @@ class SleepDetector:
         # Track state changes
         if new_state != self.current_state:
             time_in_prev_state = now - self.state_start_time
-            logger.info(f"State change: {self.current_state.value} -> {new_state.value} "
-                       f"(was {time_in_prev_state:.1f}s in previous state)")
+            logger.info("State change: %s -> %s (was %.1fs in previous state)",
+                        self.current_state.value, new_state.value, time_in_prev_state)
             self.current_state = new_state
             self.state_start_time = now
         
@@ -119,13 +145,13 @@ class SleepDetector:
         """Get current sleep state as string"""
         return self.current_state.value
     
-    def get_time_in_state(self) -> float:
-        """Get seconds spent in current state"""
-        return time.time() - self.state_start_time
+    def get_time_in_state(self, now: Optional[float] = None) -> float:
+        """Get seconds spent in current state (now: time.monotonic() value)"""
+        return (time.monotonic() if now is None else now) - self.state_start_time
     
-    def get_time_since_last_movement(self) -> float:
-        """Get seconds since last detected movement"""
-        return time.time() - self.last_move_time
+    def get_time_since_last_movement(self, now: Optional[float] = None) -> float:
+        """Get seconds since last detected movement (now: time.monotonic() value)"""
+        return (time.monotonic() if now is None else now) - self.last_move_time
     
     def is_occupied(self) -> bool:
         """Check if bed is currently occupied (any state except EMPTY)"""
@@ -135,18 +161,24 @@ class SleepDetector:
         """Check if person is currently asleep"""
         return self.current_state == SleepState.ASLEEP
     
-    def get_stats(self) -> Dict:
+    def get_stats(self, now: Optional[float] = None) -> Dict:
         """
         Get current detection statistics.
         
+        Args:
+            now: time.monotonic() value to measure durations against
+                 (read once here if not given)
+        
         Returns:
             Dictionary with current state information
         """
+        if now is None:
+            now = time.monotonic()
         return {
             'state': self.current_state.value,
             'state_code': self.current_state.name,
-            'time_in_state': self.get_time_in_state(),
-            'time_since_movement': self.get_time_since_last_movement(),
+            'time_in_state': now - self.state_start_time,
+            'time_since_movement': now - self.last_move_time,
             'last_voltage': self.last_voltage,
             'last_variance': self.last_variance,
             'is_occupied': self.is_occupied(),
@@ -156,8 +188,7 @@ class SleepDetector:
     def reset(self):
         """Reset detector to initial state"""
         self.current_state = SleepState.EMPTY
-        self.last_move_time = time.time()
-        self.state_start_time = time.time()
+        self.last_move_time = self.state_start_time = time.monotonic()
         logger.info("SleepDetector reset")
 
 
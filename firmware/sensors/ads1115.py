@@ -13,16 +13,28 @@ ADS1115 Register Map:
 I2C Address: 0x48 (default, can be 0x48-0x4B based on ADDR pin)
 """
 
+import errno
 import logging
+import random
+import struct
 import time
-from typing import Optional
+import weakref
+from array import array
+from typing import List, Optional
 
 try:
-    from smbus2 import SMBus
+    from smbus2 import SMBus, i2c_msg
 except ImportError:
     SMBus = None
+    i2c_msg = None
     logging.warning("smbus2 not available. Using mock mode for testing.")
 
+try:
+    import gpiod
+    from gpiod.line import Bias, Edge
+except ImportError:
+    gpiod = None
+
 # ADS1115 Constants
 ADS1115_ADDRESS = 0x48
 
@@ -47,7 +59,26 @@ CONFIG_COMP_QUE = 0  # Comparator queue (2 bits)
 MUX_AIN0_GND = 0x04  # Single-ended AIN0
 PGA_4_096V = 0x01  # ±4.096V full scale
 MODE_SINGLE = 0x01  # Single-shot mode
-DR_128SPS = 0x04  # 128 samples per second
+DR_128SPS = 0x04  # 128 samples per second (~7.8ms conversions, driver default)
+DR_860SPS = 0x07  # 860 samples per second (~1.2ms conversions, more noise)
+DATA_RATES = (8, 16, 32, 64, 128, 250, 475, 860)  # SPS, indexed by DR code
+
+# Threshold values that turn ALERT/RDY into a conversion-ready signal
+# (Hi_thresh MSB set, Lo_thresh MSB clear; datasheet 9.3.8)
+RDY_HI_THRESH = 0x8000
+RDY_LO_THRESH = 0x0000
+
+# Mock mode replays a fixed table of FSR-range readings (1.0V to 3.3V)
+# instead of drawing a fresh random number per sample
+MOCK_TABLE_SIZE = 4096  # Power of two, indexed with a mask
+MOCK_TABLE_MASK = MOCK_TABLE_SIZE - 1
+
+# Big-endian signed 16-bit, the layout of every ADS1115 register
+_UNPACK_I16 = struct.Struct(">h").unpack
+
+# Errors meaning the address was NACKed: the device is absent, so
+# retrying with backoff would only stall the caller
+I2C_NACK_ERRNOS = (errno.ENXIO, errno.EREMOTEIO)
 
 logger = logging.getLogger(__name__)
 
@@ -58,16 +89,35 @@ class ADS1115Error(Exception):
     pass
 
 
+def _close_bus(bus) -> None:
+    """Close the I2C bus of an ADS1115 that was collected without close()"""
+    try:
+        bus.close()
+    except Exception:
+        pass  # Interpreter may be shutting down; nothing left to report to
+
+
 class ADS1115:
     """
     ADS1115 16-bit ADC driver with byte-level I2C communication.
 
     Implements specification #10: Byte-level I2C without existing libraries.
     Uses smbus2 for I2C bus access but implements all register logic manually.
+
+    The bus is opened once in __init__ and held for the driver's lifetime;
+    create one instance and reuse it rather than one per sample. Use it as
+    a context manager, or call close(); otherwise the bus is closed when
+    the instance is garbage collected or the interpreter exits.
     """
 
     def __init__(
-        self, bus: int = 1, address: int = ADS1115_ADDRESS, mock: bool = False
+        self,
+        bus: int = 1,
+        address: int = ADS1115_ADDRESS,
+        mock: bool = False,
+        rdy_gpio: Optional[int] = None,
+        gpio_chip: str = "/dev/gpiochip0",
+        data_rate: int = DR_128SPS,
     ):
         """
         Initialize ADS1115 ADC.
@@ -76,16 +126,40 @@ class ADS1115:
             bus: I2C bus number (usually 1 on Raspberry Pi)
             address: I2C address (default 0x48)
             mock: If True, use mock mode for testing without hardware
+            rdy_gpio: GPIO line wired to ALERT/RDY; conversions are then
+                      awaited as a falling edge instead of a fixed
+                      conversion-time wait (None = timed wait)
+            gpio_chip: GPIO chip device that owns rdy_gpio
+            data_rate: DR code (index into DATA_RATES). Higher rates finish
+                       each conversion sooner at the cost of more noise
         """
+        if not 0 <= data_rate < len(DATA_RATES):
+            raise ADS1115Error(f"Invalid data rate code: {data_rate}")
+
         self.bus_num = bus
         self.address = address
         self.mock = mock or SMBus is None
         self.bus = None
         self._last_value = 0
+        self.rdy_gpio = rdy_gpio
+        self.data_rate = data_rate
+        # Seconds per conversion at the configured data rate
+        self._conversion_period = 1.0 / DATA_RATES[data_rate]
+        # Single-shot wait: the internal oscillator is only within ±10%, plus
+        # a little slack for the I2C write that started the conversion
+        self._conversion_wait = self._conversion_period * 1.1 + 0.0005
+        self._rdy = None  # gpiod line request while ALERT/RDY is in use
+        self._continuous_channel = None  # Channel converting continuously
+        self._read_msgs = {}  # Pointer -> reusable (write, read) i2c_msg pair
+        self._write_msgs = {}  # (pointer << 16 | value) -> reusable write i2c_msg
+        self._mock_table = None
+        self._alive = None  # Result of the last I2C transaction (None = none yet)
+        self._mock_idx = 0
 
         if not self.mock:
             try:
                 self.bus = SMBus(self.bus_num)
+                self._finalizer = weakref.finalize(self, _close_bus, self.bus)
                 logger.info(
                     f"ADS1115 initialized on I2C bus {bus}, address 0x{address:02X}"
                 )
@@ -94,39 +168,126 @@ class ADS1115:
                 raise ADS1115Error(f"I2C bus {bus} not accessible: {e}")
         else:
             logger.info("ADS1115 running in MOCK mode")
+            rng = random.Random(0)
+            self._mock_table = array(
+                "h", (rng.randint(8000, 26000) for _ in range(MOCK_TABLE_SIZE))
+            )
+
+        if rdy_gpio is not None and not self.mock:
+            self._setup_rdy(gpio_chip, rdy_gpio)
+
+        # Single-shot config word for each channel; the settings are fixed
+        # once ALERT/RDY is decided, so read_raw just indexes this
+        self._single_shot_config = tuple(self._build_config(ch) for ch in range(4))
+
+    def _setup_rdy(self, chip: str, line: int) -> None:
+        """
+        Use ALERT/RDY as a conversion-ready interrupt.
+
+        Programs the threshold registers so the pin pulses low at the end
+        of every conversion and requests falling-edge events on the GPIO
+        line. Falls back to the timed wait if gpiod or the line is unavailable.
+
+        Args:
+            chip: GPIO chip device path
+            line: GPIO line offset wired to ALERT/RDY
+        """
+        if gpiod is None:
+            logger.warning("gpiod not available; waiting out conversion time instead")
+            return
+
+        try:
+            self._rdy = gpiod.request_lines(
+                chip,
+                consumer="ads1115-rdy",
+                config={
+                    line: gpiod.LineSettings(
+                        edge_detection=Edge.FALLING, bias=Bias.PULL_UP
+                    )
+                },
+            )
+            self._write_register(POINTER_HI_THRESH, RDY_HI_THRESH)
+            self._write_register(POINTER_LO_THRESH, RDY_LO_THRESH)
+            logger.info(f"ADS1115 conversion ready on GPIO {line}")
+        except Exception as e:
+            logger.warning(f"ALERT/RDY setup failed, using timed wait: {e}")
+            if self._rdy is not None:
+                self._rdy.release()
+                self._rdy = None
+
+    def _mock_sample(self) -> int:
+        """Next reading from the cyclic mock table"""
+        i = self._mock_idx
+        self._mock_idx = i + 1
+        return self._mock_table[i & MOCK_TABLE_MASK]
+
+    def _drain_ready(self) -> None:
+        """Discard ALERT/RDY edges left over from earlier conversions"""
+        while self._rdy.wait_edge_events(0):
+            self._rdy.read_edge_events()
+
+    def _wait_ready(self, timeout: float) -> bool:
+        """
+        Sleep until ALERT/RDY signals a finished conversion.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the edge arrived, False on timeout
+        """
+        if not self._rdy.wait_edge_events(timeout):
+            return False
+        self._rdy.read_edge_events()
+        return True
 
     def _write_register(self, pointer: int, value: int, retries: int = 3) -> None:
         """
         Write 16-bit value to ADS1115 register using byte-level I2C.
 
         Spec #10: Demonstrates byte-level I2C communication.
-        Writes 3 bytes: pointer register + 2 data bytes (MSB first).
+        Writes 3 bytes: pointer register + 2 data bytes (MSB first),
+        sent as a single raw I2C message. The driver only ever writes a
+        handful of distinct words (per-channel config, thresholds), so
+        each message is built once and replayed on later writes.
 
         Args:
             pointer: Register address (0x00-0x03)
             value: 16-bit value to write
-            retries: Number of retry attempts on failure
+            retries: Number of attempts on transient failure (a NACK,
+                     i.e. device absent, fails on the first)
         """
         if self.mock:
             return
 
-        # Convert 16-bit value to two bytes (MSB first, as per ADS1115 spec)
-        msb = (value >> 8) & 0xFF
-        lsb = value & 0xFF
+        key = (pointer << 16) | value
+        msg = self._write_msgs.get(key)
+        if msg is None:
+            # Convert 16-bit value to two bytes (MSB first, as per ADS1115 spec)
+            msb = (value >> 8) & 0xFF
+            lsb = value & 0xFF
+            msg = self._write_msgs[key] = i2c_msg.write(
+                self.address, [pointer, msb, lsb]
+            )
 
         for attempt in range(retries):
             try:
                 # Spec #10: Byte-level write - pointer + 2 data bytes
-                self.bus.write_i2c_block_data(self.address, pointer, [msb, lsb])
+                self.bus.i2c_rdwr(msg)
+                self._alive = True
                 return
             except Exception as e:
-                if attempt < retries - 1:
+                nack = isinstance(e, OSError) and e.errno in I2C_NACK_ERRNOS
+                if attempt < retries - 1 and not nack:
                     logger.warning(
-                        f"I2C write failed (attempt {attempt + 1}), retrying: {e}"
+                        "I2C write failed (attempt %d), retrying: %s", attempt + 1, e
                     )
                     time.sleep(0.1 * (attempt + 1))  # Exponential backoff
                 else:
-                    logger.error(f"I2C write failed after {retries} attempts: {e}")
+                    logger.error(
+                        "I2C write failed after %d attempts: %s", attempt + 1, e
+                    )
+                    self._alive = False
                     raise ADS1115Error(f"Failed to write register 0x{pointer:02X}: {e}")
 
     def _read_register(self, pointer: int, retries: int = 3) -> int:
@@ -134,47 +295,54 @@ class ADS1115:
         Read 16-bit value from ADS1115 register using byte-level I2C.
 
         Spec #10: Demonstrates byte-level I2C communication.
-        Writes pointer, then reads 2 bytes (MSB first) and combines.
+        Writes pointer, then reads 2 bytes (MSB first) and combines. Both
+        messages go to the kernel in one i2c_rdwr call (pointer write,
+        repeated START, read), so no other bus master can move the pointer
+        in between. The message pair for each pointer is built once and
+        reused; the read buffer is refilled in place on every transfer.
 
         Args:
             pointer: Register address (0x00-0x03)
-            retries: Number of retry attempts on failure
+            retries: Number of attempts on transient failure (a NACK,
+                     i.e. device absent, fails on the first)
 
         Returns:
             16-bit signed integer value
         """
         if self.mock:
             # Return mock value for testing
-            import random
+            return self._mock_sample()
 
-            return random.randint(0, 65535)
+        msgs = self._read_msgs.get(pointer)
+        if msgs is None:
+            msgs = self._read_msgs[pointer] = (
+                i2c_msg.write(self.address, [pointer]),
+                i2c_msg.read(self.address, 2),
+            )
 
         for attempt in range(retries):
             try:
                 # Spec #10: Byte-level communication
-                # First write pointer register
-                self.bus.write_byte(self.address, pointer)
-
-                # Then read 2 bytes (MSB, LSB)
-                data = self.bus.read_i2c_block_data(self.address, pointer, 2)
-
-                # Combine bytes: MSB << 8 | LSB
-                value = (data[0] << 8) | data[1]
+                # Write pointer register, then read 2 bytes (MSB, LSB)
+                self.bus.i2c_rdwr(*msgs)
+                self._alive = True
 
-                # Convert to signed 16-bit if necessary (two's complement)
-                if value & 0x8000:
-                    value -= 65536
-
-                return value
+                # Combine bytes (MSB << 8 | LSB) and sign-extend the 16-bit
+                # two's complement value in one C-level unpack
+                return _UNPACK_I16(bytes(msgs[1]))[0]
 
             except Exception as e:
-                if attempt < retries - 1:
+                nack = isinstance(e, OSError) and e.errno in I2C_NACK_ERRNOS
+                if attempt < retries - 1 and not nack:
                     logger.warning(
-                        f"I2C read failed (attempt {attempt + 1}), retrying: {e}"
+                        "I2C read failed (attempt %d), retrying: %s", attempt + 1, e
                     )
                     time.sleep(0.1 * (attempt + 1))
                 else:
-                    logger.error(f"I2C read failed after {retries} attempts: {e}")
+                    logger.error(
+                        "I2C read failed after %d attempts: %s", attempt + 1, e
+                    )
+                    self._alive = False
                     raise ADS1115Error(f"Failed to read register 0x{pointer:02X}: {e}")
 
     def _build_config(self, channel: int = 0, continuous: bool = False) -> int:
@@ -205,11 +373,13 @@ class ADS1115:
         else:
             config |= MODE_SINGLE << CONFIG_MODE
 
-        # Set data rate to 128 SPS
-        config |= DR_128SPS << CONFIG_DR
+        # Set data rate (128 SPS unless configured otherwise)
+        config |= self.data_rate << CONFIG_DR
 
-        # Disable comparator
-        config |= 0x03 << CONFIG_COMP_QUE
+        # Comparator: assert ALERT/RDY after each conversion when it is
+        # wired up (queue 00, active low, non-latching), else disable
+        if self._rdy is None:
+            config |= 0x03 << CONFIG_COMP_QUE
 
         return config
 
@@ -219,41 +389,50 @@ class ADS1115:
 
         Spec #10: Byte-level I2C read sequence:
         1. Write config to start conversion
-        2. Poll/wait for conversion complete
+        2. Wait for conversion complete (ALERT/RDY edge, or the
+           data-rate conversion time)
         3. Read 2 bytes from conversion register
 
         Args:
             channel: ADC channel (0-3)
-            timeout: Maximum time to wait for conversion
+            timeout: Maximum time to wait for ALERT/RDY
 
         Returns:
             16-bit signed integer (-32768 to 32767)
         """
         if self.mock:
-            import random
-
             # Return realistic mock values for FSR (1.0V to 3.3V range)
-            return random.randint(8000, 26000)
+            return self._mock_sample()
+
+        if channel == self._continuous_channel:
+            # Already converting this channel: the conversion register
+            # holds the latest result, one read and no config write/poll
+            raw_value = self._read_register(POINTER_CONVERSION)
+            self._last_value = raw_value
+            return raw_value
 
         try:
-            # Build configuration to start single-shot conversion
-            config = self._build_config(channel, continuous=False)
+            # Precomputed configuration to start single-shot conversion
+            config = self._single_shot_config[channel & 0x03]
 
-            # Write config register (starts conversion)
-            self._write_register(POINTER_CONFIG, config)
+            if self._rdy is not None:
+                self._drain_ready()
 
-            # Wait for conversion to complete (at 128 SPS, takes ~8ms)
-            time.sleep(0.01)
+            # Write config register (starts conversion). This takes the ADC
+            # out of continuous mode on any other channel
+            self._continuous_channel = None
+            self._write_register(POINTER_CONFIG, config)
 
-            # Poll until conversion complete (OS bit goes to 0)
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                status = self._read_register(POINTER_CONFIG)
-                # OS bit (bit 15) = 0 means conversion in progress
-                # OS bit = 1 means conversion complete
-                if status & (1 << CONFIG_OS):
-                    break
-                time.sleep(0.001)  # 1ms polling interval
+            if self._rdy is not None:
+                # ALERT/RDY falls when the conversion is done; no bus
+                # traffic while waiting
+                if not self._wait_ready(timeout):
+                    logger.warning("Timed out waiting for ALERT/RDY")
+            else:
+                # Conversion time is fixed by the data rate (~7.8ms at
+                # 128 SPS, ~1.2ms at 860 SPS), so wait it out once instead
+                # of polling the OS bit over I2C
+                time.sleep(self._conversion_wait)
 
             # Read conversion result
             raw_value = self._read_register(POINTER_CONVERSION)
@@ -264,7 +443,7 @@ class ADS1115:
         except ADS1115Error:
             raise
         except Exception as e:
-            logger.error(f"Unexpected error reading ADC: {e}")
+            logger.error("Unexpected error reading ADC: %s", e)
             # Return last known good value
             return self._last_value
 
@@ -287,26 +466,218 @@ class ADS1115:
 
         return voltage
 
-    def is_connected(self) -> bool:
-        """Check if ADS1115 is accessible on I2C bus"""
-        if self.mock:
-            return True
+    def read_block(
+        self,
+        channel: int = 0,
+        n: int = 5,
+        pga: float = 4.096,
+        period: Optional[float] = None,
+    ) -> List[float]:
+        """
+        Read n consecutive voltages using continuous-conversion mode.
+
+        The config register (MUX/PGA/data rate) is written once; each sample
+        is then a single conversion-register read paced at the data rate,
+        instead of a config write + status poll + read per sample. The ADC is
+        returned to single-shot (power-down) mode afterwards, unless
+        start_continuous() already has this channel running.
+
+        Args:
+            channel: ADC channel (0-3)
+            n: Number of samples to read
+            pga: Programmable gain amplifier voltage (default ±4.096V)
+            period: Seconds between samples (None = one conversion period)
+
+        Returns:
+            List of n voltages, oldest first
+        """
+        scale = pga / 32767.0
+        return [raw * scale for raw in self.read_raw_burst(channel, n, period)]
 
+    def read_voltage_burst(
+        self, channel: int = 0, n: int = 5, pga: float = 4.096, out=None
+    ):
+        """
+        Read a burst of voltages as a float32 NumPy array.
+
+        The raw burst is viewed in place as int16 and scaled with one
+        vectorised multiply. Needs numpy (imported on first use, so the
+        sampling firmware itself doesn't depend on it).
+
+        Args:
+            channel: ADC channel (0-3)
+            n: Number of samples to read
+            pga: Programmable gain amplifier voltage (default ±4.096V)
+            out: Optional preallocated float32 array of length n to fill
+
+        Returns:
+            float32 array of n voltages, oldest first
+        """
+        import numpy as np
+
+        raw = np.frombuffer(self.read_raw_burst(channel, n), dtype=np.int16)
+        return np.multiply(raw, np.float32(pga / 32767.0), out=out, dtype=np.float32)
+
+    def read_raw_burst(
+        self, channel: int = 0, n: int = 5, period: Optional[float] = None
+    ) -> array:
+        """
+        Read n consecutive raw conversions in continuous-conversion mode.
+
+        The config register is written once (skipped if start_continuous()
+        already has this channel running); each sample is then one
+        conversion-register read, paced on absolute deadlines (or by
+        ALERT/RDY when wired) so read time doesn't stretch the period.
+
+        With a period longer than one conversion, samples are spaced by
+        deadline only (the ADC keeps converting in between) and, if the
+        channel is already running, the first one is read straight away:
+        back-to-back bursts of n samples every n * period then sample
+        evenly.
+
+        Args:
+            channel: ADC channel (0-3)
+            n: Number of samples to read
+            period: Seconds between samples, at least one conversion
+                    period (None = one conversion period)
+
+        Returns:
+            array('h') of n signed 16-bit values, oldest first
+        """
+        out = array("h", bytes(2 * n))
+        if period is None:
+            period = self._conversion_period
+        wait_rdy = self._rdy is not None and period <= self._conversion_period
+
+        if self.mock:
+            table = self._mock_table
+            start = self._mock_idx
+            for i in range(n):
+                out[i] = table[(start + i) & MOCK_TABLE_MASK]
+            self._mock_idx = start + n
+            return out
+
+        # Already converting this channel: just read, and leave it running
+        keep_running = channel == self._continuous_channel
+
+        if wait_rdy:
+            self._drain_ready()
+        if not keep_running:
+            # Reconfigures the ADC: any other continuous channel is stopped
+            self._continuous_channel = None
+            self._write_register(
+                POINTER_CONFIG, self._build_config(channel, continuous=True)
+            )
         try:
-            # Try to read config register
-            self._read_register(POINTER_CONFIG)
+            read = self._read_register
+            deadline = time.monotonic()
+            if keep_running and period > self._conversion_period:
+                # A finished conversion is already waiting
+                deadline -= period
+            for i in range(n):
+                # A fresh conversion lands every conversion period (and
+                # pulses ALERT/RDY when wired)
+                if wait_rdy:
+                    self._wait_ready(4 * period)
+                else:
+                    deadline += period
+                    delay = deadline - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                out[i] = read(POINTER_CONVERSION)
+            if n:
+                self._last_value = out[-1]
+            return out
+        finally:
+            if not keep_running:
+                self._power_down(channel)
+
+    def start_continuous(self, channel: int = 0) -> None:
+        """
+        Keep the ADC converting channel continuously.
+
+        The config register is written once here; until stop_continuous(),
+        read_raw/read_voltage on this channel are a single conversion-
+        register read and read_block skips its per-burst config writes.
+
+        Args:
+            channel: ADC channel (0-3)
+        """
+        if self.mock or channel == self._continuous_channel:
+            return
+
+        self._write_register(POINTER_CONFIG, self._build_config(channel, continuous=True))
+        self._continuous_channel = channel
+        # Let the first conversion land before anyone reads the result
+        time.sleep(self._conversion_period)
+
+    def stop_continuous(self) -> None:
+        """Return the ADC to single-shot (power-down) mode"""
+        if self._continuous_channel is None:
+            return
+
+        channel = self._continuous_channel
+        self._continuous_channel = None
+        self._power_down(channel)
+
+    def _power_down(self, channel: int) -> None:
+        """Write a single-shot config with OS clear (starts no conversion)"""
+        self._write_register(
+            POINTER_CONFIG,
+            self._build_config(channel, continuous=False) & ~(1 << CONFIG_OS),
+        )
+
+    def is_connected(self, refresh: bool = False) -> bool:
+        """
+        Check if ADS1115 is accessible on I2C bus.
+
+        Answers from the outcome of the last register transfer, so periodic
+        health checks cost no bus traffic. The config register is only
+        probed before the first transfer or when refresh is True.
+
+        Args:
+            refresh: Re-probe the device instead of using the cached result
+
+        Returns:
+            True if the device responded
+        """
+        if self.mock:
             return True
-        except:
-            return False
+
+        if refresh or self._alive is None:
+            try:
+                # Try to read config register
+                self._read_register(POINTER_CONFIG)
+            except ADS1115Error:
+                pass
+        return self._alive
+
+    def __enter__(self) -> "ADS1115":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
     def close(self):
-        """Close I2C bus connection"""
+        """Close I2C bus connection (safe to call more than once)"""
+        if self._rdy is not None:
+            self._rdy.release()
+            self._rdy = None
+
+        if self._continuous_channel is not None:
+            try:
+                self.stop_continuous()
+            except ADS1115Error as e:
+                logger.warning("Could not power down ADS1115: %s", e)
+
         if self.bus and not self.mock:
+            self._finalizer.detach()
             try:
                 self.bus.close()
                 logger.info("ADS1115 I2C bus closed")
             except Exception as e:
-                logger.warning(f"Error closing I2C bus: {e}")
+                logger.warning("Error closing I2C bus: %s", e)
+            self.bus = None
 
 
 # Convenience function for testing
@@ -314,12 +685,10 @@ if __name__ == "__main__":
     # Test with mock mode
     logging.basicConfig(level=logging.INFO)
 
-    adc = ADS1115(mock=True)
-    print(f"Mock ADS1115 initialized: {adc.is_connected()}")
+    with ADS1115(mock=True) as adc:
+        print(f"Mock ADS1115 initialized: {adc.is_connected()}")
 
-    # Read a few samples
-    for i in range(5):
-        raw = adc.read_raw(0)
-        voltage = adc.read_voltage(0)
-        print(f"Sample {i + 1}: Raw={raw}, Voltage={voltage:.3f}V")
-        time.sleep(0.5)
+        # Read a few samples in one burst
+        for i, raw in enumerate(adc.read_raw_burst(0, 5, period=0.5)):
+            voltage = (raw / 32767.0) * 4.096
+            print(f"Sample {i + 1}: Raw={raw}, Voltage={voltage:.3f}V")
@@ -17,10 +17,11 @@ SIMULATION MODE:
 import logging
 import math
 import random
-import statistics
 import time
 from collections import deque
-from typing import Dict, List, Optional
+from enum import IntEnum
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
 
 from .ads1115 import ADS1115, ADS1115Error
 
@@ -33,6 +34,41 @@ class FSR408Error(Exception):
     pass
 
 
+class _SimState(IntEnum):
+    """Simulation phases (values index FSR408._SIM_HANDLERS)"""
+
+    EMPTY = 0
+    GETTING_IN = 1
+    OCCUPIED = 2
+    RESTLESS = 3
+    GETTING_UP = 4
+
+
+def _mean_std(samples: List[float]) -> Tuple[float, float]:
+    """
+    Mean and sample standard deviation of calibration readings in two
+    float passes (statistics.mean/stdev use exact Fraction arithmetic,
+    ~20x slower for no benefit on ADC voltages).
+
+    Args:
+        samples: Voltage readings
+
+    Returns:
+        Tuple of (mean, standard deviation); deviation is 0 for one sample
+
+    Raises:
+        FSR408Error: If no samples were collected
+    """
+    n = len(samples)
+    if n == 0:
+        raise FSR408Error("No calibration samples collected")
+
+    mean = math.fsum(samples) / n
+    if n < 2:
+        return mean, 0.0
+    return mean, math.sqrt(math.fsum([(x - mean) ** 2 for x in samples]) / (n - 1))
+
+
 class FSR408:
     """
     FSR408 Force Sensitive Resistor interface with simulation fallback.
@@ -80,8 +116,9 @@ class FSR408:
         self.window_size = window_size
 
         # Calibration values
-        self.baseline_voltage = self.DEFAULT_BASELINE
-        self.occupied_threshold = self.DEFAULT_OCCUPIED
+        self._baseline_voltage = self.DEFAULT_BASELINE
+        self._occupied_threshold = self.DEFAULT_OCCUPIED
+        self._update_force_scale()
         self.movement_threshold = self.DEFAULT_MOVEMENT
         self.calibrated_at = None
 
@@ -89,14 +126,16 @@ class FSR408:
         self.voltage_buffer = deque(maxlen=window_size)
         self._last_reading = 0.0
 
+        # Running mean / sum of squared deviations over voltage_buffer
+        self._var_mean = 0.0
+        self._var_m2 = 0.0
+
         # Simulation mode tracking
         self.simulation_mode = simulation_mode
         self._zero_reading_count = 0
         self._simulation_start_time = None
-        self._simulation_state = (
-            "empty"  # empty, getting_in, occupied, restless, getting_up
-        )
-        self._simulation_state_start = time.time()
+        self._simulation_state = _SimState.EMPTY
+        self._simulation_state_start = time.monotonic()
         self._simulation_base_voltage = 0.5  # Baseline for simulation
 
         logger.info(f"FSR408 initialized on channel {channel}")
@@ -104,6 +143,35 @@ class FSR408:
             logger.warning("FSR408 starting in SIMULATION MODE")
             self._enable_simulation_mode()
 
+    @property
+    def baseline_voltage(self) -> float:
+        """Voltage when no force applied (V)"""
+        return self._baseline_voltage
+
+    @baseline_voltage.setter
+    def baseline_voltage(self, value: float) -> None:
+        self._baseline_voltage = value
+        self._update_force_scale()
+
+    @property
+    def occupied_threshold(self) -> float:
+        """Voltage when occupied (V)"""
+        return self._occupied_threshold
+
+    @occupied_threshold.setter
+    def occupied_threshold(self, value: float) -> None:
+        self._occupied_threshold = value
+        self._update_force_scale()
+
+    def _update_force_scale(self) -> None:
+        """
+        Cache the percent-per-volt scale of the calibrated range, so
+        voltage_to_force multiplies instead of dividing on every sample.
+        Zero marks an empty or inverted range.
+        """
+        voltage_range = self._occupied_threshold - self._baseline_voltage
+        self._force_scale = 100.0 / voltage_range if voltage_range > 0 else 0.0
+
     def _check_for_broken_sensor(self, voltage: float) -> None:
         """
         Check if sensor appears to be broken and enable simulation mode.
@@ -131,9 +199,8 @@ class FSR408:
     def _enable_simulation_mode(self) -> None:
         """Enable simulation mode and initialize simulation state."""
         self.simulation_mode = True
-        self._simulation_start_time = time.time()
-        self._simulation_state = "empty"
-        self._simulation_state_start = time.time()
+        self._simulation_start_time = self._simulation_state_start = time.monotonic()
+        self._simulation_state = _SimState.EMPTY
 
         logger.warning("=" * 70)
         logger.warning("  SIMULATION MODE ENABLED")
@@ -141,7 +208,7 @@ class FSR408:
         logger.warning("  This is NOT real sensor data!")
         logger.warning("=" * 70)
 
-    def _get_simulated_voltage(self) -> float:
+    def _get_simulated_voltage(self, now: Optional[float] = None) -> float:
         """
         Generate realistic simulated voltage readings.
 
@@ -154,87 +221,106 @@ class FSR408:
         - Getting up (60-65min): Falling 2.0V → 0.5V
         - Empty again: ~0.5V
 
+        Args:
+            now: time.monotonic() value the sample is taken at (None = now)
+
         Returns:
             Simulated voltage value
         """
-        elapsed = time.time() - self._simulation_start_time
-        state_time = time.time() - self._simulation_state_start
-
-        # State machine for sleep simulation
-        if self._simulation_state == "empty":
-            # Empty bed - low voltage with minimal noise
-            base = 0.5
-            noise = random.gauss(0, 0.02)
-            voltage = base + noise
-
-            # Transition: After 10-60 seconds, simulate getting in bed
-            if state_time > random.uniform(10, 60):
-                self._simulation_state = "getting_in"
-                self._simulation_state_start = time.time()
-                logger.info("🛏️  SIMULATION: Person getting into bed")
-
-        elif self._simulation_state == "getting_in":
-            # Getting in bed - voltage rises
-            progress = min(state_time / 5.0, 1.0)  # 5 second transition
-            base = 0.5 + (1.5 * progress)  # 0.5 → 2.0V
-            noise = random.gauss(0, 0.1)  # Higher noise during movement
-            voltage = base + noise
-
-            # Transition: After getting in, become occupied
-            if progress >= 1.0:
-                self._simulation_state = "occupied"
-                self._simulation_state_start = time.time()
-                logger.info("😴 SIMULATION: Person settled in bed (sleeping)")
-
-        elif self._simulation_state == "occupied":
-            # Occupied/sleeping - stable voltage with breathing variations
-            breathing = 0.05 * math.sin(elapsed * 0.3)  # Slow breathing
-            noise = random.gauss(0, 0.03)
-            voltage = 2.0 + breathing + noise
-
-            # Transition: Random chance of restlessness
-            if state_time > 20 and random.random() < 0.02:  # 2% chance per reading
-                self._simulation_state = "restless"
-                self._simulation_state_start = time.time()
-                logger.info("🔄 SIMULATION: Person moving (restless sleep)")
-
-            # Transition: After 30-90 seconds, might get up
-            elif state_time > random.uniform(30, 90) and random.random() < 0.05:
-                self._simulation_state = "getting_up"
-                self._simulation_state_start = time.time()
-                logger.info("🚶 SIMULATION: Person getting out of bed")
-
-        elif self._simulation_state == "restless":
-            # Restless - higher variance, shifting position
-            shift = 0.3 * math.sin(elapsed * 2)  # Faster movement
-            noise = random.gauss(0, 0.15)  # High noise
-            voltage = 1.8 + shift + noise
-
-            # Transition: Return to stable sleep after 5-10 seconds
-            if state_time > random.uniform(5, 10):
-                self._simulation_state = "occupied"
-                self._simulation_state_start = time.time()
-                logger.info("😴 SIMULATION: Person settled again")
-
-        elif self._simulation_state == "getting_up":
-            # Getting up - voltage falls
-            progress = min(state_time / 5.0, 1.0)  # 5 second transition
-            base = 2.0 - (1.5 * progress)  # 2.0 → 0.5V
-            noise = random.gauss(0, 0.1)  # Higher noise during movement
-            voltage = base + noise
-
-            # Transition: Back to empty
-            if progress >= 1.0:
-                self._simulation_state = "empty"
-                self._simulation_state_start = time.time()
-                logger.info("🛏️  SIMULATION: Bed is empty")
-
-        else:
-            # Fallback
-            voltage = 0.5
+        # One clock read per sample; monotonic so wall-clock steps (NTP)
+        # can't jump the simulated sleep cycle
+        if now is None:
+            now = time.monotonic()
+        elapsed = now - self._simulation_start_time
+        state_time = now - self._simulation_state_start
+
+        # State machine for sleep simulation: one handler per phase
+        voltage = self._SIM_HANDLERS[self._simulation_state](
+            self, now, elapsed, state_time
+        )
 
         return max(0.0, min(3.3, voltage))  # Clamp to valid range
 
+    def _sim_transition(self, state: _SimState, now: float, message: str) -> None:
+        """Enter a new simulation phase"""
+        self._simulation_state = state
+        self._simulation_state_start = now
+        logger.info(message)
+
+    def _sim_empty(self, now: float, elapsed: float, state_time: float) -> float:
+        """Empty bed - low voltage with minimal noise"""
+        voltage = 0.5 + random.gauss(0, 0.02)
+
+        # Transition: After 10-60 seconds, simulate getting in bed
+        if state_time > random.uniform(10, 60):
+            self._sim_transition(
+                _SimState.GETTING_IN, now, "🛏️  SIMULATION: Person getting into bed"
+            )
+        return voltage
+
+    def _sim_getting_in(self, now: float, elapsed: float, state_time: float) -> float:
+        """Getting in bed - voltage rises"""
+        progress = min(state_time / 5.0, 1.0)  # 5 second transition
+        base = 0.5 + (1.5 * progress)  # 0.5 → 2.0V
+        voltage = base + random.gauss(0, 0.1)  # Higher noise during movement
+
+        # Transition: After getting in, become occupied
+        if progress >= 1.0:
+            self._sim_transition(
+                _SimState.OCCUPIED, now, "😴 SIMULATION: Person settled in bed (sleeping)"
+            )
+        return voltage
+
+    def _sim_occupied(self, now: float, elapsed: float, state_time: float) -> float:
+        """Occupied/sleeping - stable voltage with breathing variations"""
+        breathing = 0.05 * math.sin(elapsed * 0.3)  # Slow breathing
+        voltage = 2.0 + breathing + random.gauss(0, 0.03)
+
+        # Transition: Random chance of restlessness
+        if state_time > 20 and random.random() < 0.02:  # 2% chance per reading
+            self._sim_transition(
+                _SimState.RESTLESS, now, "🔄 SIMULATION: Person moving (restless sleep)"
+            )
+
+        # Transition: After 30-90 seconds, might get up
+        elif state_time > random.uniform(30, 90) and random.random() < 0.05:
+            self._sim_transition(
+                _SimState.GETTING_UP, now, "🚶 SIMULATION: Person getting out of bed"
+            )
+        return voltage
+
+    def _sim_restless(self, now: float, elapsed: float, state_time: float) -> float:
+        """Restless - higher variance, shifting position"""
+        shift = 0.3 * math.sin(elapsed * 2)  # Faster movement
+        voltage = 1.8 + shift + random.gauss(0, 0.15)  # High noise
+
+        # Transition: Return to stable sleep after 5-10 seconds
+        if state_time > random.uniform(5, 10):
+            self._sim_transition(
+                _SimState.OCCUPIED, now, "😴 SIMULATION: Person settled again"
+            )
+        return voltage
+
+    def _sim_getting_up(self, now: float, elapsed: float, state_time: float) -> float:
+        """Getting up - voltage falls"""
+        progress = min(state_time / 5.0, 1.0)  # 5 second transition
+        base = 2.0 - (1.5 * progress)  # 2.0 → 0.5V
+        voltage = base + random.gauss(0, 0.1)  # Higher noise during movement
+
+        # Transition: Back to empty
+        if progress >= 1.0:
+            self._sim_transition(_SimState.EMPTY, now, "🛏️  SIMULATION: Bed is empty")
+        return voltage
+
+    # Phase handlers indexed by _SimState (plain functions, called with self)
+    _SIM_HANDLERS = (
+        _sim_empty,
+        _sim_getting_in,
+        _sim_occupied,
+        _sim_restless,
+        _sim_getting_up,
+    )
+
     def is_calibrated(self) -> bool:
         """
         Check if sensor has valid calibration data.
@@ -321,10 +407,7 @@ class FSR408:
 
         # Measure baseline (no force)
         baseline_samples = self._collect_samples(50, 5.0)
-        self.baseline_voltage = statistics.mean(baseline_samples)
-        baseline_std = (
-            statistics.stdev(baseline_samples) if len(baseline_samples) > 1 else 0
-        )
+        self.baseline_voltage, baseline_std = _mean_std(baseline_samples)
 
         logger.info(
             f"Baseline measured: {self.baseline_voltage:.3f}V (±{baseline_std:.3f}V)"
@@ -340,10 +423,7 @@ class FSR408:
 
         # Measure occupied state
         occupied_samples = self._collect_samples(50, 5.0)
-        self.occupied_threshold = statistics.mean(occupied_samples)
-        occupied_std = (
-            statistics.stdev(occupied_samples) if len(occupied_samples) > 1 else 0
-        )
+        self.occupied_threshold, occupied_std = _mean_std(occupied_samples)
 
         logger.info(
             f"Occupied measured: {self.occupied_threshold:.3f}V (±{occupied_std:.3f}V)"
@@ -444,15 +524,79 @@ class FSR408:
 
             return voltage
         except ADS1115Error as e:
-            logger.error(f"Failed to read FSR voltage on channel {self.channel}: {e}")
-            logger.error(f"Returning last known value: {self._last_reading:.4f}V")
+            logger.error("Failed to read FSR voltage on channel %d: %s", self.channel, e)
+            logger.error("Returning last known value: %.4fV", self._last_reading)
             # Return last known good value
             return self._last_reading
         except Exception as e:
-            logger.error(f"Unexpected error reading FSR on channel {self.channel}: {e}")
-            logger.error(f"Returning last known value: {self._last_reading:.4f}V")
+            logger.error(
+                "Unexpected error reading FSR on channel %d: %s", self.channel, e
+            )
+            logger.error("Returning last known value: %.4fV", self._last_reading)
             return self._last_reading
 
+    def read_block(self, n: int = 5, period: Optional[float] = None) -> List[float]:
+        """
+        Read a burst of n voltages in one ADC transaction.
+
+        Uses the ADC's continuous-conversion block read so the channel is
+        configured once per burst rather than once per sample.
+
+        Args:
+            n: Number of samples to read
+            period: Seconds between samples (None = back-to-back at the
+                    ADC data rate). Simulation doesn't wait: the burst is
+                    simulated as if it ended now, one period per sample
+
+        Returns:
+            List of n voltages (real or simulated), oldest first
+        """
+        if self.simulation_mode:
+            end = time.monotonic()
+            step = period or 0.0
+            voltages = [
+                self._get_simulated_voltage(end - (n - 1 - i) * step)
+                for i in range(n)
+            ]
+            self._last_reading = voltages[-1]
+            return voltages
+
+        try:
+            voltages = self.adc.read_block(self.channel, n, period=period)
+        except ADS1115Error as e:
+            logger.error("Failed to read FSR block on channel %d: %s", self.channel, e)
+            logger.error("Returning last known value: %.4fV", self._last_reading)
+            return [self._last_reading] * n
+
+        for voltage in voltages:
+            self._check_for_broken_sensor(voltage)
+        self._last_reading = voltages[-1]
+        return voltages
+
+    def process_block(self, voltages: List[float]):
+        """
+        Compute force percentage and rolling variance for each sample of a
+        block, feeding the samples through the variance window in order.
+
+        Args:
+            voltages: Voltages from read_block()
+
+        Returns:
+            Tuple of (force percentages, variances), one entry per sample
+        """
+        voltage_to_force = self.voltage_to_force
+        push = self._push_voltage
+        buf = self.voltage_buffer
+
+        forces = []
+        variances = []
+        for voltage in voltages:
+            forces.append(voltage_to_force(voltage))
+            push(voltage)
+            n = len(buf)
+            variances.append(max(self._var_m2 / n, 0.0) if n >= 2 else 0.0)
+        return forces, variances
+
     def get_force_percentage(self) -> float:
         """
         Calculate force as percentage of calibrated range.
@@ -462,15 +606,25 @@ class FSR408:
             - 0%: No force (baseline)
             - 100%: Full occupied threshold
         """
-        voltage = self.get_voltage()
+        return self.voltage_to_force(self.get_voltage())
+
+    def voltage_to_force(self, voltage: float) -> float:
+        """
+        Convert a voltage to force percentage of the calibrated range.
 
-        # Calculate percentage
-        voltage_range = self.occupied_threshold - self.baseline_voltage
+        Args:
+            voltage: Voltage reading in volts
+
+        Returns:
+            Force percentage (0-100%)
+        """
+        # Percent per volt, cached whenever the calibration changes
+        scale = self._force_scale
 
-        if voltage_range <= 0:
+        if scale == 0.0:
             return 0.0
 
-        percentage = ((voltage - self.baseline_voltage) / voltage_range) * 100.0
+        percentage = (voltage - self._baseline_voltage) * scale
 
         # Clamp to 0-100%
         return max(0.0, min(100.0, percentage))
@@ -488,12 +642,16 @@ class FSR408:
         force_pct = self.get_force_percentage()
         return force_pct > threshold_percent
 
-    def get_variance(self, window_size: Optional[int] = None) -> float:
+    def get_variance(
+        self, window_size: Optional[int] = None, voltage: Optional[float] = None
+    ) -> float:
         """
         Calculate variance of recent readings for movement detection.
 
         Args:
             window_size: Number of samples to use (default: self.window_size)
+            voltage: Reading already taken this tick to add to the window
+                     (default: read a new one with get_voltage())
 
         Returns:
             Variance of voltage readings (0.0 if insufficient data)
@@ -501,15 +659,22 @@ class FSR408:
         size = window_size or self.window_size
 
         # Add current reading to buffer
-        voltage = self.get_voltage()
-        self.voltage_buffer.append(voltage)
+        if voltage is None:
+            voltage = self.get_voltage()
+        self._push_voltage(voltage)
+
+        n = len(self.voltage_buffer)
 
         # Need at least 2 samples for variance
-        if len(self.voltage_buffer) < 2:
+        if n < 2:
             return 0.0
 
-        # Calculate variance using recent samples
-        recent = list(self.voltage_buffer)[-size:]
+        if size >= n:
+            return max(self._var_m2 / n, 0.0)
+
+        # Narrower window than the buffer: fall back to a direct pass over
+        # just the newest `size` readings (no copy of the whole deque)
+        recent = list(islice(reversed(self.voltage_buffer), size))
 
         if len(recent) < 2:
             return 0.0
@@ -519,6 +684,31 @@ class FSR408:
 
         return variance
 
+    def _push_voltage(self, voltage: float):
+        """
+        Append a reading to the rolling buffer, updating the running
+        statistics in O(1) (Welford's update, West's removal for the
+        sample that falls out of the window).
+
+        Args:
+            voltage: New voltage reading
+        """
+        buf = self.voltage_buffer
+        if len(buf) == buf.maxlen:
+            old = buf[0]
+            buf.append(voltage)
+            n = len(buf)
+            delta = voltage - old
+            old_mean = self._var_mean
+            self._var_mean = old_mean + delta / n
+            self._var_m2 += delta * (voltage - self._var_mean + old - old_mean)
+        else:
+            buf.append(voltage)
+            n = len(buf)
+            delta = voltage - self._var_mean
+            self._var_mean += delta / n
+            self._var_m2 += delta * (voltage - self._var_mean)
+
     def get_calibration(self) -> Dict:
         """
         Get current calibration values.
@@ -537,24 +727,57 @@ class FSR408:
         """
         Get complete sensor data for MQTT transmission.
 
+        All fields are derived from a single reading, so one snapshot costs
+        one ADC transaction (or one simulation step) and the fields agree.
+
         Returns:
             Dictionary with all sensor readings and metadata
             Format matches data_manager.to_json() expectations
         """
         voltage = self.get_voltage()
-        force_pct = self.get_force_percentage()
-        variance = self.get_variance()
+        force_pct = self.voltage_to_force(voltage)
+        variance = self.get_variance(voltage=voltage)
 
         return {
             "voltage": voltage,
             "force_percent": force_pct,
             "variance": variance,
-            "is_occupied": self.is_occupied(),
+            "is_occupied": force_pct > 20.0,  # is_occupied() default threshold
             "channel": self.channel,
             "calibrated": self.calibrated_at is not None,
             "simulation_mode": self.simulation_mode,  # Add flag to indicate simulated data
         }
 
+    def get_sensor_batch(self, n: int = 5, threshold_percent: float = 20.0) -> Dict:
+        """
+        Batch counterpart of get_sensor_data, laid out column-wise.
+
+        One ADC burst (read_block) feeds one process_block pass, so the
+        cost per sample is a float append rather than a full snapshot
+        dict with its own ADC transaction.
+
+        Args:
+            n: Number of samples to read
+            threshold_percent: Force percentage threshold for occupancy
+
+        Returns:
+            Dictionary of per-sample lists ("voltage", "force_percent",
+            "variance", "is_occupied"), oldest first, plus the same
+            metadata fields as get_sensor_data
+        """
+        voltages = self.read_block(n)
+        forces, variances = self.process_block(voltages)
+
+        return {
+            "voltage": voltages,
+            "force_percent": forces,
+            "variance": variances,
+            "is_occupied": [f > threshold_percent for f in forces],
+            "channel": self.channel,
+            "calibrated": self.calibrated_at is not None,
+            "simulation_mode": self.simulation_mode,
+        }
+
 
 # Convenience function for testing
 if __name__ == "__main__":
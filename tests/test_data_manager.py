@@ -7,7 +7,9 @@ import unittest
 import sys
 import os
 import json
+import threading
 import time
+from collections import deque
 from pathlib import Path
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
@@ -36,6 +38,7 @@ class TestDataManager(unittest.TestCase):
     
     def tearDown(self):
         """Clean up test database"""
+        self.dm.close()
         if os.path.exists(self.test_db):
             os.remove(self.test_db)
     
@@ -44,6 +47,77 @@ class TestDataManager(unittest.TestCase):
         # Tables should be created in setUp
         stats = self.dm.get_stats()
         self.assertIn('total_readings', stats)
+
+    def test_schema_version_skips_ddl_on_reopen(self):
+        """Test schema version is recorded and reopening keeps data"""
+        self.dm.store_reading(2.5, 75.0, "Asleep", 0.02)
+        self.dm.close()
+
+        self.dm = DataManager(db_path=self.test_db)
+        version = self.dm._c().execute("PRAGMA user_version").fetchone()[0]
+        self.assertEqual(version, DataManager.SCHEMA_VERSION)
+        self.assertEqual(self.dm.get_stats()['total_readings'], 1)
+
+    def test_migrates_text_timestamps(self):
+        """Test v1 DATETIME text timestamps are migrated to microseconds"""
+        import sqlite3
+        
+        self.dm.close()
+        os.remove(self.test_db)
+        with sqlite3.connect(self.test_db) as conn:
+            conn.execute("""
+                CREATE TABLE readings (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    voltage REAL, force_percent REAL, state TEXT, variance REAL,
+                    synced BOOLEAN DEFAULT 0,
+                    device_id TEXT DEFAULT 'rpi_node_1',
+                    user_id TEXT DEFAULT 'user_001'
+                )
+            """)
+            conn.execute("""
+                INSERT INTO readings (timestamp, voltage, force_percent, state, variance)
+                VALUES ('2026-02-03 14:30:00', 2.0, 50.0, 'Asleep', 0.02)
+            """)
+        
+        self.dm = DataManager(db_path=self.test_db)
+        unsynced = self.dm.get_unsynced_readings()
+        
+        self.assertEqual(len(unsynced), 1)
+        self.assertEqual(unsynced[0]['timestamp'], 1770129000 * 1_000_000)
+    
+    def test_migrates_text_states_to_codes(self):
+        """Test v4 TEXT states are migrated to integer codes"""
+        import sqlite3
+        
+        self.dm.close()
+        os.remove(self.test_db)
+        with sqlite3.connect(self.test_db) as conn:
+            conn.execute("""
+                CREATE TABLE readings (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp INTEGER NOT NULL,
+                    voltage REAL, force_percent REAL, state TEXT, variance REAL,
+                    device_id TEXT DEFAULT 'rpi_node_1',
+                    user_id TEXT DEFAULT 'user_001'
+                )
+            """)
+            conn.execute("CREATE TABLE unsynced (id INTEGER PRIMARY KEY)")
+            conn.executemany(
+                "INSERT INTO readings (timestamp, voltage, force_percent, state, variance) "
+                "VALUES (?, 2.0, 50.0, ?, 0.02)",
+                [(1770129000000000, 'Asleep'), (1770129001000000, 'Empty Bed')],
+            )
+            conn.execute("INSERT INTO unsynced (id) VALUES (2)")
+            conn.execute("PRAGMA user_version = 4")
+        
+        self.dm = DataManager(db_path=self.test_db)
+        unsynced = self.dm.get_unsynced_readings()
+        
+        self.assertEqual([r['id'] for r in unsynced], [2])
+        self.assertEqual(unsynced[0]['state'], 'Empty Bed')
+        types = self.dm._c().execute("SELECT DISTINCT typeof(state) FROM readings").fetchall()
+        self.assertEqual(types, [('integer',)])
     
     def test_store_reading(self):
         """Test storing a reading"""
@@ -83,6 +157,28 @@ class TestDataManager(unittest.TestCase):
         unsynced = self.dm.get_unsynced_readings()
         self.assertEqual(len(unsynced), 0)
     
+    def test_mark_synced_many_ids(self):
+        """Test marking more IDs than SQLite's host-parameter limit"""
+        self.dm.store_readings([(2.0, 50.0, "Asleep", 0.02)] * 1200)
+        
+        ids = [r['id'] for r in self.dm.get_unsynced_readings(limit=1200)]
+        self.assertEqual(len(ids), 1200)
+        self.assertTrue(self.dm.mark_synced(ids))
+        
+        self.assertEqual(self.dm.get_stats()['unsynced_readings'], 0)
+    
+    def test_mark_synced_through(self):
+        """Test range-marking an unsynced batch by its largest ID"""
+        for i in range(5):
+            self.dm.store_reading(2.0, 50.0, "Asleep", 0.02)
+        
+        batch = self.dm.get_unsynced_readings(limit=3)
+        self.assertTrue(self.dm.mark_synced_through(batch[-1]['id']))
+        
+        remaining = self.dm.get_unsynced_readings()
+        self.assertEqual(len(remaining), 2)
+        self.assertGreater(remaining[0]['id'], batch[-1]['id'])
+    
     def test_get_unsynced_readings_limit(self):
         """Test limit on unsynced readings"""
         # Store multiple readings
@@ -156,6 +252,18 @@ class TestDataManager(unittest.TestCase):
         self.assertEqual(parsed['state'], 'Unknown')
         self.assertIn('timestamp', parsed)
     
+    def test_to_json_unsynced_row(self):
+        """Test rows from get_unsynced_readings serialize directly"""
+        self.dm.store_reading(2.45, 67.5, "Asleep", 0.02)
+        
+        row = self.dm.get_unsynced_readings()[0]
+        parsed = json.loads(self.dm.to_json(row))
+        
+        self.assertEqual(parsed['voltage'], 2.45)
+        self.assertEqual(parsed['force_percent'], 67.5)
+        self.assertEqual(parsed['state'], 'Asleep')
+        self.assertRegex(parsed['timestamp'], r'^\d{4}-\d{2}-\d{2}T')
+    
     def test_get_recent_readings(self):
         """Test getting recent readings"""
         # Store readings
@@ -186,6 +294,21 @@ class TestDataManager(unittest.TestCase):
         self.assertEqual(stats['unsynced_readings'], 3)
         self.assertIn('database_size_mb', stats)
     
+    def test_use_after_close(self):
+        """Test reads and writes after close() run inline instead of hanging"""
+        self.dm.store_reading(2.0, 50.0, "Asleep", 0.02)
+        self.dm.close()
+        
+        stats = self.dm.get_stats()
+        self.assertEqual(stats['total_readings'], 1)
+        
+        self.assertTrue(self.dm.store_reading(2.1, 55.0, "Asleep", 0.02))
+        self.assertEqual(len(self.dm.get_recent_readings(hours=1)), 2)
+        
+        ran = []
+        self.dm.submit(lambda: ran.append(True))
+        self.assertEqual(ran, [True])
+    
     def test_memory_queue_overflow(self):
         """Test memory queue when SQLite fails"""
         # Mock SQLite to fail
@@ -193,10 +316,24 @@ class TestDataManager(unittest.TestCase):
             # Store many readings
             for i in range(5):
                 self.dm.store_reading(2.0, 50.0, "Asleep", 0.02)
+            
+            # Batch write fails
+            self.assertFalse(self.dm.flush())
         
         # Should have items in memory queue
         self.assertEqual(len(self.dm._memory_queue), 5)
 
+    def test_memory_queue_drops_oldest_when_full(self):
+        """Test bounded memory queue evicts oldest readings"""
+        self.dm._memory_queue = deque(maxlen=3)
+        with patch.object(self.dm, '_execute_with_retry', side_effect=Exception("DB Error")):
+            for i in range(5):
+                self.dm.store_reading(float(i), 50.0, "Asleep", 0.02)
+            self.assertFalse(self.dm.flush())
+
+        voltages = [item['voltage'] for item in self.dm._memory_queue]
+        self.assertEqual(voltages, [2.0, 3.0, 4.0])
+
 
 class TestDataManagerRetention(unittest.TestCase):
     """Test 30-day retention policy"""
@@ -211,15 +348,17 @@ class TestDataManagerRetention(unittest.TestCase):
     
     def tearDown(self):
         """Clean up"""
-        if os.path.exists(self.test_db):
-            os.remove(self.test_db)
+        self.dm.close()
+        for path in (self.test_db, self.test_db + "-wal", self.test_db + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
     
     def test_cleanup_old_data(self):
         """Test cleanup of old data"""
         import sqlite3
         
         # Insert old data (manually set timestamp)
-        old_date = (datetime.now() - timedelta(days=31)).isoformat()
+        old_date = int((datetime.now() - timedelta(days=31)).timestamp() * 1_000_000)
         
         with sqlite3.connect(self.test_db) as conn:
             cursor = conn.cursor()
@@ -241,13 +380,35 @@ class TestDataManagerRetention(unittest.TestCase):
         # Verify only recent data remains
         stats = self.dm.get_stats()
         self.assertEqual(stats['total_readings'], 1)
+        # Deleted rows leave the unsynced side table too
+        self.assertEqual(stats['unsynced_readings'], 1)
+    
+    def test_cleanup_chunks_and_incremental_vacuum(self):
+        """Test cleanup deletes across chunks with incremental auto-vacuum"""
+        import sqlite3
+        
+        old_date = int((datetime.now() - timedelta(days=31)).timestamp() * 1_000_000)
+        
+        with sqlite3.connect(self.test_db) as conn:
+            conn.executemany("""
+                INSERT INTO readings (timestamp, voltage, force_percent, state, variance)
+                VALUES (?, 2.0, 50.0, 'Asleep', 0.02)
+            """, [(old_date,)] * (DataManager.CLEANUP_CHUNK + 5))
+            conn.commit()
+            # 2 = INCREMENTAL
+            self.assertEqual(conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+        
+        deleted = self.dm.cleanup_old_data()
+        
+        self.assertEqual(deleted, DataManager.CLEANUP_CHUNK + 5)
+        self.assertEqual(self.dm.get_stats()['total_readings'], 0)
     
     def test_retention_30_days(self):
         """Test that data is kept for 30 days"""
         import sqlite3
         
         # Insert data at 29 days old (should be kept)
-        old_date = (datetime.now() - timedelta(days=29)).isoformat()
+        old_date = int((datetime.now() - timedelta(days=29)).timestamp() * 1_000_000)
         
         with sqlite3.connect(self.test_db) as conn:
             cursor = conn.cursor()
@@ -274,6 +435,7 @@ class TestDataManagerErrorHandling(unittest.TestCase):
         self.dm = DataManager(db_path=self.test_db)
     
     def tearDown(self):
+        self.dm.close()
         if os.path.exists(self.test_db):
             os.remove(self.test_db)
     
@@ -294,14 +456,111 @@ class TestDataManagerErrorHandling(unittest.TestCase):
         # Should retry and eventually succeed
         # Note: This test is simplified; real test would need more mocking
     
+    def test_batched_store(self):
+        """Test readings are queued and written on flush"""
+        for i in range(3):
+            self.assertTrue(self.dm.store_reading(2.0, 50.0, "Asleep", 0.02))
+        
+        self.assertTrue(self.dm.flush())
+        self.assertEqual(len(self.dm._pending), 0)
+        
+        stats = self.dm.get_stats()
+        self.assertEqual(stats['total_readings'], 3)
+    
+    def test_store_readings_group(self):
+        """Test storing a group of readings in one call"""
+        readings = [(2.0 + i * 0.1, 50.0, "Asleep", 0.02) for i in range(5)]
+        
+        self.assertTrue(self.dm.store_readings(readings))
+        
+        self.assertEqual(self.dm.get_stats()['total_readings'], 5)
+    
+    def test_store_readings_group_timestamps(self):
+        """Test readings in a group are back-dated by their sample offset"""
+        readings = [(2.0 + i * 0.1, 50.0, "Asleep", 0.02) for i in range(5)]
+        
+        self.assertTrue(self.dm.store_readings(readings, period_us=100_000))
+        self.dm.flush()
+        
+        rows = self.dm._c().execute(
+            "SELECT timestamp, voltage FROM readings ORDER BY voltage"
+        ).fetchall()
+        stamps = [row[0] for row in rows]
+        self.assertEqual(len(stamps), 5)
+        for earlier, later in zip(stamps, stamps[1:]):
+            self.assertEqual(later - earlier, 100_000)
+        
+        # An explicit end time pins the last reading
+        self.assertTrue(self.dm.store_readings(readings[:2], end_us=1_000_000))
+        self.dm.flush()
+        rows = self.dm._c().execute(
+            "SELECT timestamp FROM readings WHERE timestamp <= 1000000 "
+            "ORDER BY timestamp"
+        ).fetchall()
+        self.assertEqual(
+            [row[0] for row in rows],
+            [1_000_000 - DataManager.READING_PERIOD_US, 1_000_000]
+        )
+    
+    def test_store_reading_drops_when_worker_backed_up(self):
+        """Test store_reading never blocks when the worker queue is full"""
+        started, blocker = threading.Event(), threading.Event()
+        self.dm.submit(lambda: (started.set(), blocker.wait()))
+        started.wait(timeout=5)
+        try:
+            for i in range(DataManager.WORKER_QUEUE_SIZE):
+                self.dm.store_reading(2.0, 50.0, "Asleep", 0.02)
+            
+            self.assertFalse(self.dm.store_reading(2.0, 50.0, "Asleep", 0.02))
+        finally:
+            blocker.set()
+        
+        self.assertGreaterEqual(self.dm.get_stats()['dropped_readings'], 1)
+    
+    def test_submit_drops_when_worker_backed_up(self):
+        """Test submit never blocks when the worker queue is full"""
+        started, blocker = threading.Event(), threading.Event()
+        self.assertTrue(self.dm.submit(lambda: (started.set(), blocker.wait())))
+        started.wait(timeout=5)
+        ran = []
+        try:
+            for i in range(DataManager.WORKER_QUEUE_SIZE):
+                self.assertTrue(self.dm.submit(lambda: None))
+            
+            self.assertFalse(self.dm.submit(lambda: ran.append(True)))
+        finally:
+            blocker.set()
+        
+        self.dm.flush()
+        self.assertEqual(ran, [])
+    
+    def test_batch_size_triggers_flush(self):
+        """Test a full batch is written without an explicit flush"""
+        for i in range(DataManager.BATCH_SIZE):
+            self.dm.store_reading(2.0, 50.0, "Asleep", 0.02)
+        
+        # Wait for the worker to drain the queue
+        self.dm._worker_q.join()
+        self.assertEqual(len(self.dm._pending), 0)
+    
+    def test_submit_runs_on_worker(self):
+        """Test submitted jobs run on the background worker thread"""
+        import threading
+        
+        ran_on = []
+        self.dm.submit(lambda: ran_on.append(threading.current_thread().name))
+        self.dm._worker_q.join()
+        
+        self.assertEqual(ran_on, ["DataManagerWorker"])
+    
     def test_flush_memory_queue(self):
         """Test flushing memory queue to database"""
         # Add items to queue
         self.dm._memory_queue = [
             {'voltage': 1.0, 'force_percent': 25.0, 'state': 'Asleep', 
-             'variance': 0.01, 'timestamp': '2026-02-03T14:30:00'},
+             'variance': 0.01, 'timestamp': 1770129000000000},
             {'voltage': 2.0, 'force_percent': 50.0, 'state': 'Asleep', 
-             'variance': 0.02, 'timestamp': '2026-02-03T14:30:01'}
+             'variance': 0.02, 'timestamp': 1770129001000000}
         ]
         
         # Flush
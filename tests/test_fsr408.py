@@ -25,6 +25,9 @@ class MockADC:
     def read_voltage(self, channel):
         return self.voltage
     
+    def read_block(self, channel, n, period=None):
+        return [self.voltage] * n
+    
     def is_connected(self):
         return True
 
@@ -104,6 +107,19 @@ class TestFSR408(unittest.TestCase):
         occupied = self.fsr.is_occupied(threshold_percent=20.0)
         self.assertTrue(occupied)
     
+    def test_voltage_to_force_tracks_calibration(self):
+        """Test the cached force scale follows calibration changes"""
+        self.fsr.baseline_voltage = 0.5
+        self.fsr.occupied_threshold = 2.5
+        self.assertEqual(self.fsr.voltage_to_force(1.5), 50.0)
+        
+        self.fsr.occupied_threshold = 4.5
+        self.assertEqual(self.fsr.voltage_to_force(1.5), 25.0)
+        
+        # Inverted range is treated as uncalibrated
+        self.fsr.baseline_voltage = 5.0
+        self.assertEqual(self.fsr.voltage_to_force(1.5), 0.0)
+    
     def test_is_occupied_false(self):
         """Test occupancy detection (empty)"""
         self.mock_adc.voltage = 0.6
@@ -129,6 +145,42 @@ class TestFSR408(unittest.TestCase):
         variance = self.fsr.get_variance()
         self.assertGreater(variance, 0.0)
     
+    def test_get_variance_rolling_matches_direct(self):
+        """Test running variance agrees with a direct pass once the window wraps"""
+        voltages = [1.0 + 0.05 * ((i * 7) % 11) for i in range(3 * self.fsr.window_size)]
+        for v in voltages:
+            self.mock_adc.voltage = v
+            variance = self.fsr.get_variance()
+
+        recent = voltages[-self.fsr.window_size:]
+        mean = sum(recent) / len(recent)
+        expected = sum((x - mean) ** 2 for x in recent) / len(recent)
+        self.assertAlmostEqual(variance, expected, places=9)
+
+    def test_get_variance_narrow_window(self):
+        """Test a window narrower than the buffer uses only the newest readings"""
+        for v in [5.0, 5.0, 1.0, 1.2, 1.4]:
+            self.mock_adc.voltage = v
+            variance = self.fsr.get_variance(window_size=3)
+        
+        # Newest three: 1.0, 1.2, 1.4 -> population variance 0.08 / 3
+        self.assertAlmostEqual(variance, 0.08 / 3, places=9)
+    
+    def test_read_block_and_process(self):
+        """Test block read feeds the same force/variance as per-sample reads"""
+        self.fsr.baseline_voltage = 0.5
+        self.fsr.occupied_threshold = 2.5
+        self.mock_adc.voltage = 1.5
+        
+        voltages = self.fsr.read_block(5)
+        self.assertEqual(voltages, [1.5] * 5)
+        
+        forces, variances = self.fsr.process_block([1.0, 1.1, 1.2, 1.1, 1.0])
+        for f, v in zip(forces, [1.0, 1.1, 1.2, 1.1, 1.0]):
+            self.assertAlmostEqual(f, self.fsr.voltage_to_force(v))
+        self.assertEqual(variances[0], 0.0)
+        self.assertAlmostEqual(variances[-1], 0.0056, places=6)
+    
     def test_get_sensor_data(self):
         """Test sensor data dictionary generation"""
         self.mock_adc.voltage = 2.0
@@ -148,6 +200,70 @@ class TestFSR408(unittest.TestCase):
         self.assertEqual(data['voltage'], 2.0)
         self.assertEqual(data['channel'], 0)
         self.assertTrue(data['calibrated'])
+    
+    def test_get_sensor_batch(self):
+        """Test batch snapshot returns per-sample columns from one burst"""
+        self.fsr.baseline_voltage = 0.5
+        self.fsr.occupied_threshold = 2.5
+        self.mock_adc.read_block = Mock(return_value=[0.5, 1.5, 2.5])
+        
+        batch = self.fsr.get_sensor_batch(3)
+        
+        self.mock_adc.read_block.assert_called_once_with(0, 3, period=None)
+        self.assertEqual(batch['voltage'], [0.5, 1.5, 2.5])
+        self.assertEqual(batch['force_percent'], [0.0, 50.0, 100.0])
+        self.assertEqual(batch['is_occupied'], [False, True, True])
+        self.assertEqual(batch['variance'][0], 0.0)
+        self.assertAlmostEqual(batch['variance'][-1], 2.0 / 3)
+        self.assertFalse(batch['calibrated'])
+    
+    def test_get_sensor_data_single_read(self):
+        """Test a snapshot takes one ADC reading shared by every field"""
+        self.fsr.baseline_voltage = 0.5
+        self.fsr.occupied_threshold = 2.5
+        self.mock_adc.read_voltage = Mock(side_effect=[2.0, 0.5, 0.5, 0.5])
+        
+        data = self.fsr.get_sensor_data()
+        
+        self.mock_adc.read_voltage.assert_called_once_with(0)
+        self.assertAlmostEqual(data['force_percent'], 75.0)
+        self.assertTrue(data['is_occupied'])
+        self.assertEqual(list(self.fsr.voltage_buffer), [2.0])
+
+
+class TestFSR408Simulation(unittest.TestCase):
+    """Test the simulated sleep cycle"""
+    
+    @patch('firmware.sensors.fsr408.time.monotonic')
+    def test_simulation_cycle(self, mock_monotonic):
+        """Test the simulation moves from an empty bed to occupied"""
+        mock_monotonic.return_value = 0.0
+        fsr = FSR408(MockADC(), simulation_mode=True)
+        self.assertEqual(fsr._simulation_state, 0)  # Empty
+        
+        # Past the longest empty wait: person gets in, ~0.5V
+        mock_monotonic.return_value = 61.0
+        self.assertLess(fsr.get_voltage(), 1.0)
+        self.assertEqual(fsr._simulation_state, 1)  # Getting in
+        
+        # 5 second rise completes: settled at ~2.0V
+        mock_monotonic.return_value = 66.0
+        self.assertGreater(fsr.get_voltage(), 1.5)
+        self.assertEqual(fsr._simulation_state, 2)  # Occupied
+    
+    @patch('firmware.sensors.fsr408.time.monotonic')
+    def test_simulated_block_is_spaced(self, mock_monotonic):
+        """Test a simulated burst advances the clock one period per sample"""
+        mock_monotonic.return_value = 0.0
+        fsr = FSR408(MockADC(), simulation_mode=True)
+        
+        # Burst ending at 70s, 1s apart: the first sample (66s) gets in bed
+        mock_monotonic.return_value = 70.0
+        voltages = fsr.read_block(5, period=1.0)
+        
+        self.assertEqual(len(voltages), 5)
+        self.assertEqual(fsr._simulation_state, 1)  # Still getting in
+        self.assertEqual(fsr._simulation_state_start, 66.0)
 
 
 class TestFSR408Calibration(unittest.TestCase):
@@ -177,6 +293,19 @@ class TestFSR408Calibration(unittest.TestCase):
         result = self.fsr.is_calibrated()
         self.assertFalse(result)
     
+    @patch('firmware.sensors.fsr408.time.sleep')
+    def test_calibrate_auto(self, mock_sleep):
+        """Test non-interactive calibration averages both sample sets"""
+        readings = [0.4, 0.6] * 25 + [2.4, 2.6] * 25
+        self.mock_adc.read_voltage = Mock(side_effect=readings)
+        
+        cal = self.fsr.calibrate(interactive=False)
+        
+        self.assertAlmostEqual(cal['baseline_voltage'], 0.5)
+        self.assertAlmostEqual(cal['occupied_threshold'], 2.5)
+        self.assertAlmostEqual(cal['movement_threshold'], 0.2)
+        self.mock_dm.save_calibration.assert_called_once_with(**cal)
+    
     def test_load_calibration(self):
         """Test loading calibration"""
         cal_data = {
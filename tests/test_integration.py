@@ -60,6 +60,7 @@ class TestFSRIntegration(unittest.TestCase):
     
     def tearDown(self):
         """Clean up"""
+        self.dm.close()
         if os.path.exists(self.test_db):
             os.remove(self.test_db)
     
@@ -145,6 +146,29 @@ class TestFSRIntegration(unittest.TestCase):
         stats = self.dm.get_stats()
         self.assertEqual(stats['total_readings'], 4)
     
+    def test_sleep_state_batch(self):
+        """Test batch state update matches per-reading updates"""
+        states = self.detector.update_batch([0.5, 2.5, 2.5], [0.01, 0.1, 0.01])
+        self.assertEqual(
+            states, [SleepState.EMPTY, SleepState.MOVING, SleepState.AWAKE]
+        )
+        self.assertEqual(self.detector.get_state(), SleepState.AWAKE)
+    
+    @patch('firmware.processing.sleep_detector.time.monotonic')
+    def test_sleep_state_batch_spaced(self, mock_monotonic):
+        """Test a spaced burst times each reading by its sample offset"""
+        mock_monotonic.return_value = 100.0
+        # Movement 3s before the burst ends, still since: asleep (delay 2s)
+        states = self.detector.update_batch(
+            [2.5, 2.5, 2.5, 2.5], [0.1, 0.01, 0.01, 0.01], period=1.0
+        )
+        
+        self.assertEqual(self.detector.get_time_since_last_movement(100.0), 3.0)
+        self.assertEqual(
+            states,
+            [SleepState.MOVING, SleepState.AWAKE, SleepState.AWAKE, SleepState.ASLEEP]
+        )
+    
     def test_json_generation(self):
         """Test JSON generation for MQTT"""
         # Create reading
@@ -227,9 +251,10 @@ class TestFSRIntegration(unittest.TestCase):
         
         # Try to store readings
         for i in range(3):
-            result = self.dm.store_reading(2.0, 50.0, 'Asleep', 0.02)
-            # Should fail to store to DB
-            self.assertFalse(result)
+            self.dm.store_reading(2.0, 50.0, 'Asleep', 0.02)
+        
+        # Batch write should fail to store to DB
+        self.assertFalse(self.dm.flush())
         
         # Should be in memory queue
         self.assertEqual(len(self.dm._memory_queue), 3)
@@ -309,6 +334,7 @@ class TestMainLoopSimulation(unittest.TestCase):
         # Should have empty, moving, and asleep states
         self.assertIn('Empty Bed', states)
         self.assertIn('Tossing/Turning', states)
+        dm.close()
 
 
 class TestSpecCompliance(unittest.TestCase):
@@ -350,6 +376,7 @@ class TestSpecCompliance(unittest.TestCase):
         self.assertEqual(stats['total_readings'], 5)
         
         # Cleanup
+        dm.close()
         os.remove(test_db)
     
     def test_json_api_for_mqtt(self):
@@ -386,6 +413,7 @@ class TestSpecCompliance(unittest.TestCase):
         self.assertEqual(parsed['device_id'], 'test_dev')
         self.assertEqual(parsed['user_id'], 'test_user')
         
+        dm.close()
         os.remove(test_db)
 
 
@@ -10,8 +10,11 @@ import numpy as np
 from firmware.processing.ml_analyzer import (
     SleepMLAnalyzer,
     NightlySummary,
+    NightlyTable,
     SleepQuality,
-    format_analysis_report
+    format_analysis_report,
+    _group_quantile,
+    _kmeans_small
 )
 
 
@@ -217,6 +220,32 @@ class TestSleepMLAnalyzer(unittest.TestCase):
         self.assertIn("RECOMMENDATIONS", report)
         self.assertIn("AVERAGE METRICS", report)
     
+    def test_kmeans_small_separated_clusters(self):
+        """Test the NumPy K-Means recovers well-separated groups"""
+        rng = np.random.default_rng(0)
+        centers = np.array([[0.0, 0.0, 0.0], [5.0, 5.0, 5.0], [-5.0, 5.0, 0.0]])
+        X = np.vstack([c + rng.normal(scale=0.1, size=(8, 3)) for c in centers])
+        
+        labels, centroids = _kmeans_small(X, 3)
+        
+        self.assertEqual(centroids.shape, (3, 3))
+        for group in range(3):
+            self.assertEqual(len(set(labels[group * 8:(group + 1) * 8])), 1)
+        self.assertEqual(len(set(labels)), 3)
+    
+    def test_group_quantile_matches_pandas(self):
+        """Test per-group quantiles match pandas groupby quantile"""
+        import pandas as pd
+        
+        values = np.array([0.3, 0.1, np.nan, 0.7, 0.2, 0.9, 0.5, 0.4, np.nan])
+        codes = np.array([0, 0, 0, 1, 1, 1, 1, 2, 3])
+        
+        result = _group_quantile(values, codes, 4, 0.8)
+        expected = pd.Series(values).groupby(codes).quantile(0.8).to_numpy()
+        
+        np.testing.assert_allclose(result, expected)
+        self.assertTrue(np.isnan(result[3]))
+    
     def _generate_night_data(self, date: datetime, sleep_hours: float, 
                             restlessness: float) -> list:
         """Generate realistic sleep data for a single night"""
@@ -272,6 +301,27 @@ class TestNightlySummary(unittest.TestCase):
         self.assertEqual(summary.date, "2024-01-15")
         self.assertEqual(summary.sleep_time_hours, 7.5)
         self.assertEqual(summary.efficiency, 93.75)
+    
+    def test_nightly_table_summaries(self):
+        """Test NightlyTable columns materialize as NightlySummary rows"""
+        table = NightlyTable(
+            dates=np.array(["2024-01-15", "2024-01-16"], dtype="datetime64[D]"),
+            total=np.array([8.0, 6.0]),
+            sleep=np.array([7.5, 4.0]),
+            awake=np.array([0.5, 2.0]),
+            movement_events=np.array([5, 12]),
+            rest=np.array([25.0, 60.0]),
+            eff=np.array([93.8, 66.7]),
+            quality=np.array([4, 1], dtype=np.int8)
+        )
+        
+        nights = table.summaries()
+        
+        self.assertEqual(len(table), 2)
+        self.assertEqual(nights[0].date, "2024-01-15")
+        self.assertEqual(nights[0].sleep_quality, SleepQuality.EXCELLENT)
+        self.assertEqual(nights[1].sleep_quality, SleepQuality.POOR)
+        self.assertEqual(nights[1].movement_events, 12)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,108 @@
+"""
+Unit tests for SupabaseClient
+Tests request body compression, its fallback, and POST retries
+"""
+
+import unittest
+import sys
+import gzip
+import json
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from firmware.communication.supabase_client import (
+    SupabaseClient, GZIP_MIN_SIZE, POST_BACKOFF, POST_BACKOFF_MAX, POST_RETRIES
+)
+
+
+class TestSupabaseClientGzip(unittest.TestCase):
+    """Test cases for gzip-compressed POST bodies"""
+    
+    def setUp(self):
+        """Set up a client with the HTTP layer mocked out"""
+        self.client = SupabaseClient("https://example.supabase.co", "test_key")
+        self.client._request = Mock(return_value=(201, b""))
+        # Large enough to be compressed
+        self.rows = [{"voltage": 2.0, "state": "Asleep"}] * 50
+        self.assertGreater(len(json.dumps(self.rows)), GZIP_MIN_SIZE)
+    
+    def test_large_body_compressed(self):
+        """Test large payloads are sent gzip-encoded"""
+        self.assertTrue(self.client._post("readings", self.rows))
+        
+        _, _, body, headers = self.client._request.call_args.args
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(body)), self.rows)
+    
+    def test_gzip_rejected_resends_uncompressed(self):
+        """Test a 415 for a gzip body is retried plain and remembered"""
+        self.client._request.side_effect = [(415, b"unsupported"), (201, b""), (201, b"")]
+        
+        self.assertTrue(self.client._post("readings", self.rows))
+        
+        self.assertEqual(self.client._request.call_count, 2)
+        _, _, body, headers = self.client._request.call_args.args
+        self.assertNotIn("Content-Encoding", headers)
+        self.assertEqual(json.loads(body), self.rows)
+        
+        # Later requests skip compression
+        self.assertTrue(self.client._post("readings", self.rows))
+        self.assertEqual(self.client._request.call_count, 3)
+        _, _, _, headers = self.client._request.call_args.args
+        self.assertNotIn("Content-Encoding", headers)
+    
+    def test_bad_request_keeps_gzip(self):
+        """Test a 400 that the plain body also gets doesn't disable gzip"""
+        self.client._request.side_effect = [(400, b"bad row"), (400, b"bad row")]
+        
+        self.assertFalse(self.client._post("readings", self.rows))
+        
+        self.assertEqual(self.client._request.call_count, 2)
+        self.client._request.side_effect = None
+        self.assertTrue(self.client._post("readings", self.rows))
+        _, _, _, headers = self.client._request.call_args.args
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+
+
+
+class TestSupabaseClientRetry(unittest.TestCase):
+    """Test cases for transient POST failure retries"""
+    
+    def setUp(self):
+        """Set up a client with the HTTP layer mocked out"""
+        self.client = SupabaseClient("https://example.supabase.co", "test_key")
+        self.client._request = Mock(return_value=(201, b""))
+    
+    @patch('firmware.communication.supabase_client.time.sleep')
+    def test_gateway_error_retried_with_jitter(self, mock_sleep):
+        """Test 503s are retried after a jittered exponential backoff"""
+        self.client._request.side_effect = [(503, b""), (503, b""), (201, b"")]
+        
+        with patch('firmware.communication.supabase_client.random.uniform',
+                   return_value=1.5) as mock_uniform:
+            self.assertTrue(self.client._post("readings", {"voltage": 2.0}))
+        
+        mock_uniform.assert_called_with(0.5, 1.5)
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertAlmostEqual(delays[0], POST_BACKOFF * 1.5)
+        self.assertAlmostEqual(delays[1], POST_BACKOFF * 2 * 1.5)
+    
+    @patch('firmware.communication.supabase_client.time.sleep')
+    def test_backoff_capped(self, mock_sleep):
+        """Test the retry wait never exceeds the cap (before jitter)"""
+        self.client._request.return_value = (503, b"")
+        
+        with patch('firmware.communication.supabase_client.POST_BACKOFF', 100.0):
+            self.assertFalse(self.client._post("readings", {"voltage": 2.0}))
+        
+        self.assertEqual(mock_sleep.call_count, POST_RETRIES)
+        for c in mock_sleep.call_args_list:
+            self.assertLessEqual(c.args[0], POST_BACKOFF_MAX * 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)